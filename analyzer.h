@@ -8,10 +8,17 @@
 #include <iomanip>
 #include <algorithm>
 #include <cmath>
+#include <thread>
+#include <mutex>
+#include <condition_variable>
+#include <deque>
+#include <exception>
 
 #include "superpowered/Superpowered.h"
 #include "superpowered/SuperpoweredDecoder.h"
 #include "superpowered/SuperpoweredAnalyzer.h"
+#include "superpowered/SuperpoweredResampler.h"
+#include "superpowered/SuperpoweredFilter.h"
 #include "SuperpoweredSimple.h"
 
 // === TABELA DE KEY (DJ) ===
@@ -59,19 +66,22 @@ public:
         // Superpowered::Initialize("..."); 
     }
 
-    AudioAnalysis analyze(const std::string& path) {
-        AudioAnalysis result;
-        result.path = path;
-        // Extract filename from path
-        size_t lastSlash = path.find_last_of("/\\");
-        result.filename = (lastSlash == std::string::npos) ? path : path.substr(lastSlash + 1);
+    // When enabled, decoding runs on a helper thread while the calling thread
+    // feeds the Analyzer. Only worth it when there are idle cores, i.e. when
+    // there are fewer files (workers) than hardware threads.
+    void setPipelinedDecode(bool enabled) { pipelinedDecode = enabled; }
+
+    // Fills only the analysis fields of an existing result (bpm, key, energy,
+    // duration, status), leaving path and tag metadata untouched. Avoids
+    // building and copying a second AudioAnalysis per file.
+    bool analyzeInto(const std::string& path, AudioAnalysis& result) {
         result.success = false;
 
         std::unique_ptr<Superpowered::Decoder> decoder(new Superpowered::Decoder());
         int openReturn = decoder->open(path.c_str());
         if (openReturn != Superpowered::Decoder::OpenSuccess) {
             result.errorMessage = "Decoder open error: " + std::to_string(openReturn);
-            return result;
+            return false;
         }
 
         result.durationSec = decoder->getDurationSeconds();
@@ -82,35 +92,74 @@ public:
         // Safety check
         if (samplerate == 0 || framesPerChunk == 0) {
             result.errorMessage = "Invalid samplerate or framesPerChunk";
-            return result;
+            return false;
         }
 
         // Ensure minimum duration for analyzer to avoid crashes on very short files
         int analysisDuration = (int)result.durationSec + 1;
         if (analysisDuration < 5) analysisDuration = 5;
 
+        // BPM/Key don't need the full bandwidth: higher rates are resampled down
+        // before the Analyzer, which roughly halves its work on 44.1/48 kHz files.
+        // Energy is still measured on the original samples.
+        bool resample = samplerate > kAnalysisSamplerate;
+        unsigned int analysisSamplerate = resample ? kAnalysisSamplerate : samplerate;
+        resampler.reset();
+        resampler.rate = (float)samplerate / (float)analysisSamplerate;
+
+        // The Resampler only interpolates, so anything above the new Nyquist
+        // would fold back into the bands used for BPM and key: low-pass first.
+        std::vector<std::unique_ptr<Superpowered::Filter>> antiAlias;
+        if (resample) {
+            for (int i = 0; i < kAntiAliasStages; ++i) {
+                antiAlias.emplace_back(new Superpowered::Filter(Superpowered::Filter::Resonant_Lowpass, samplerate));
+                antiAlias.back()->frequency = kAntiAliasCutoff;
+                antiAlias.back()->resonance = kAntiAliasResonance;
+                antiAlias.back()->enabled = true;
+            }
+        }
+
         std::unique_ptr<Superpowered::Analyzer> analyzer(
-            new Superpowered::Analyzer(samplerate, analysisDuration)
+            new Superpowered::Analyzer(analysisSamplerate, analysisDuration)
         );
 
-        std::vector<short int> intBuffer(framesPerChunk * 2);
-        std::vector<float> floatBuffer(framesPerChunk * 2);
+        // Largest number of frames handed to consume() at once
+        unsigned int maxFrames = pipelinedDecode ? framesPerChunk * (kPipelineChunks + 1) : framesPerChunk;
+
+        // decodeAudio() needs numberOfFrames * 4 + 16384 bytes of output.
+        // Buffers only grow, so a worker reuses them across files.
+        if (intBuffer.size() < framesPerChunk * 2 + 8192) intBuffer.resize(framesPerChunk * 2 + 8192);
+        if (floatBuffer.size() < maxFrames * 2 + 64) floatBuffer.resize(maxFrames * 2 + 64);
 
         double totalRms = 0.0;
         long long totalFrames = 0;
 
-        while (true) {
-            int frames = decoder->decodeAudio(intBuffer.data(), framesPerChunk);
-            if (frames < 1) break;
-
-            Superpowered::ShortIntToFloat(intBuffer.data(), floatBuffer.data(), frames);
-            analyzer->process(floatBuffer.data(), frames);
-
-            // Calculate Energy (RMS)
-            for (int i = 0; i < frames * 2; ++i) {
-                totalRms += floatBuffer[i] * floatBuffer[i];
+        // A single decode feeds both BPM/Key (Analyzer) and Energy (RMS).
+        auto consume = [&](short int* samples, int frames) {
+            if (resample) {
+                totalRms += convertAndSumSquares(samples, floatBuffer.data(), frames * 2);
+                for (auto& filter : antiAlias) filter->process(floatBuffer.data(), floatBuffer.data(), frames);
+                // The Resampler takes 16-bit input; the decoded chunk is no
+                // longer needed, so the filtered audio goes back into it.
+                Superpowered::FloatToShortInt(floatBuffer.data(), samples, frames);
+                int outFrames = resampler.process(samples, floatBuffer.data(), frames);
+                if (outFrames > 0) analyzer->process(floatBuffer.data(), outFrames);
+            } else {
+                // Conversion and energy share one pass over the chunk.
+                totalRms += convertAndSumSquares(samples, floatBuffer.data(), frames * 2);
+                analyzer->process(floatBuffer.data(), frames);
             }
             totalFrames += frames * 2;
+        };
+
+        if (pipelinedDecode) {
+            decodePipelined(decoder.get(), framesPerChunk, consume);
+        } else {
+            while (true) {
+                int frames = decoder->decodeAudio(intBuffer.data(), framesPerChunk);
+                if (frames < 1) break;
+                consume(intBuffer.data(), frames);
+            }
         }
 
         analyzer->makeResults(60, 200, 0, 0, false, 0, false, false, true);
@@ -127,13 +176,154 @@ public:
             result.keyOpenKey = "???";
         }
 
-        if (totalFrames > 0) {
-             double rmsAvg = std::sqrt(totalRms / totalFrames);
-             result.energy = std::round(rmsAvg * 100.0) / 100.0;
-        }
+        result.energy = energyFromSum(totalRms, totalFrames);
 
         result.success = true;
-        return result;
+        return true;
+    }
+
+private:
+    // Per-instance state reused across files (one Amalyzer per worker thread).
+    // The Decoder and Analyzer stay per file: a reopened Decoder yields no
+    // frames, and the Analyzer is sized by samplerate and duration.
+    Superpowered::Resampler resampler;
+    std::vector<short int> intBuffer;
+    std::vector<float> floatBuffer;
+
+    bool pipelinedDecode = false;
+
+    // Pipelined decode: blocks of kPipelineChunks decoder chunks, kPipelineBlocks in flight
+    static constexpr unsigned int kPipelineChunks = 16;
+    static constexpr int kPipelineBlocks = 4;
+
+    // Decodes on a helper thread into a small ring of blocks while the calling
+    // thread consumes them, so decoding overlaps with analysis.
+    template <typename Consume>
+    static void decodePipelined(Superpowered::Decoder* decoder, unsigned int framesPerChunk, Consume&& consume) {
+        struct Block {
+            std::vector<short int> samples;
+            int frames = 0;
+        };
+        const int blockFrames = (int)(framesPerChunk * kPipelineChunks);
+        std::vector<Block> blocks(kPipelineBlocks);
+        for (auto& b : blocks) b.samples.resize((size_t)(blockFrames + framesPerChunk) * 2 + 8192);
+
+        std::mutex mutex;
+        std::condition_variable cv;
+        std::deque<int> freeBlocks, readyBlocks;
+        for (int i = 0; i < kPipelineBlocks; ++i) freeBlocks.push_back(i);
+        bool finished = false;
+        bool stopping = false;          // Consumer failed: producer must quit
+        std::exception_ptr decodeError; // Producer failure, rethrown on the caller's thread
+
+        std::thread producer([&]() {
+            try {
+                bool endOfFile = false;
+                while (!endOfFile) {
+                    int idx;
+                    {
+                        std::unique_lock<std::mutex> lock(mutex);
+                        cv.wait(lock, [&] { return stopping || !freeBlocks.empty(); });
+                        if (stopping) return;
+                        idx = freeBlocks.front();
+                        freeBlocks.pop_front();
+                    }
+                    Block& b = blocks[idx];
+                    b.frames = 0;
+                    while (b.frames < blockFrames) {
+                        int frames = decoder->decodeAudio(b.samples.data() + b.frames * 2, framesPerChunk);
+                        if (frames < 1) { endOfFile = true; break; }
+                        b.frames += frames;
+                    }
+                    {
+                        std::lock_guard<std::mutex> lock(mutex);
+                        readyBlocks.push_back(idx);
+                        finished = endOfFile;
+                    }
+                    cv.notify_all();
+                }
+            } catch (...) {
+                {
+                    std::lock_guard<std::mutex> lock(mutex);
+                    decodeError = std::current_exception();
+                    finished = true;
+                }
+                cv.notify_all();
+            }
+        });
+
+        // If consume() throws, stop the producer and join it before unwinding:
+        // destroying a joinable std::thread would call std::terminate.
+        try {
+            while (true) {
+                int idx;
+                {
+                    std::unique_lock<std::mutex> lock(mutex);
+                    cv.wait(lock, [&] { return !readyBlocks.empty() || finished; });
+                    if (readyBlocks.empty()) break;
+                    idx = readyBlocks.front();
+                    readyBlocks.pop_front();
+                }
+                if (blocks[idx].frames > 0) consume(blocks[idx].samples.data(), blocks[idx].frames);
+                {
+                    std::lock_guard<std::mutex> lock(mutex);
+                    freeBlocks.push_back(idx);
+                }
+                cv.notify_all();
+            }
+        } catch (...) {
+            {
+                std::lock_guard<std::mutex> lock(mutex);
+                stopping = true;
+            }
+            cv.notify_all();
+            producer.join();
+            throw;
+        }
+        producer.join();
+        if (decodeError) std::rethrow_exception(decodeError);
+    }
+
+    // Sample rate fed to the Analyzer (key detection only looks below ~3.5 kHz)
+    static constexpr unsigned int kAnalysisSamplerate = 22050;
+
+    // Anti-alias low-pass ahead of the Resampler: cascaded 2-pole sections
+    // (Q = 0.707), flat through the key range and far down above 11 kHz
+    static constexpr int kAntiAliasStages = 4;
+    static constexpr float kAntiAliasCutoff = 7000.0f;
+    static constexpr float kAntiAliasResonance = 0.0707f;
+
+    // Same scale as Superpowered::ShortIntToFloat (32767 -> 1.0)
+    static constexpr float kShortToFloat = 1.0f / 32767.0f;
+
+    // Energy (RMS) helper, working on the already decoded chunk.
+    // Converts 16-bit samples to float and returns their sum of squares in the
+    // same pass. Eight independent float lanes let the compiler vectorize the
+    // reduction (a single double accumulator forces a serial dependency chain).
+    static double convertAndSumSquares(const short int* input, float* output, int count) {
+        float lanes[8] = {0.0f};
+        int i = 0;
+        for (; i + 8 <= count; i += 8) {
+            for (int j = 0; j < 8; ++j) {
+                float v = input[i + j] * kShortToFloat;
+                output[i + j] = v;
+                lanes[j] += v * v;
+            }
+        }
+        double sum = 0.0;
+        for (int j = 0; j < 8; ++j) sum += lanes[j];
+        for (; i < count; ++i) {
+            float v = input[i] * kShortToFloat;
+            output[i] = v;
+            sum += v * v;
+        }
+        return sum;
+    }
+
+    static double energyFromSum(double sumSquares, long long sampleCount) {
+        if (sampleCount <= 0) return 0.0;
+        double rmsAvg = std::sqrt(sumSquares / sampleCount);
+        return std::round(rmsAvg * 100.0) / 100.0;
     }
 };
 
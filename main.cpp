@@ -13,6 +13,14 @@
 #include <set>        // Conjuntos ordenados
 #include <map>        // Mapas (dicionários)
 #include <stdexcept>  // Exceções padrão
+#include <limits>     // Limites numéricos (filtros sem limite)
+#include <thread>     // Workers de análise em paralelo
+#include <atomic>     // Contadores compartilhados entre workers
+#include <mutex>      // Serialização da saída no terminal
+#include <condition_variable> // Sinalização entre o pool e seus workers
+#include <functional> // Tarefas do pool de workers
+#include <deque>      // Fila de arquivos entre a busca e os workers
+#include <chrono>     // Intervalo mínimo entre redesenhos da barra de progresso
 
 // ==============================
 // 📦 BIBLIOTECAS DO PROJETO
@@ -45,6 +53,12 @@
 #include <taglib/xiphcomment.h>             // Comentários Xiph (OGG/FLAC)
 #include <taglib/tpropertymap.h>            // Mapa de propriedades genérico
 
+#ifdef __linux__
+#include <sched.h> // sched_getaffinity: núcleos disponíveis para o processo
+#include <fcntl.h>  // posix_fadvise: leitura antecipada do próximo arquivo
+#include <unistd.h> // close
+#endif
+
 // Alias para facilitar o uso do namespace filesystem
 namespace fs = std::filesystem;
 
@@ -62,9 +76,18 @@ const std::string MAGENTA = "\033[95m"; // Magenta
 const std::string BOLD = "\033[1m";     // Negrito
 const std::string DIM = "\033[2m";      // Texto esmaecido
 
+// Linhas separadoras, montadas uma única vez
+const std::string SEPARATOR_DOUBLE = "════════════════════════";
+const std::string SEPARATOR = "────────────────────────";
+
 // Flag global para controlar se deve suprimir a saída
+// Só é alterada durante o parse dos argumentos, antes de qualquer worker
+// existir; depois disso as threads apenas leem, sem precisar de sincronização
 bool IS_SILENT = false;
 
+// Protege cout/cerr quando vários workers escrevem ao mesmo tempo
+std::mutex OUTPUT_MUTEX;
+
 // ==============================
 // 🎵 ESTRUTURAS DE DADOS
 // ==============================
@@ -118,12 +141,12 @@ struct ProgramArgs
     double maxBpm = 0.0;        // -bpm-max: BPM máximo
     double minSizeMB = 0.0;     // -size-min: tamanho mínimo em MB
     double maxSizeMB = 0.0;     // -size-max: tamanho máximo em MB
-    std::string targetKey = ""; // -key: filtrar por tonalidade (ex: 8B)
+    std::string targetKey = ""; // -key: filtrar por tonalidade (ex: 8B), já em minúsculas
     int limit = 0;              // -limit: limitar número de arquivos
 
     // Opções de escrita de tags
     std::vector<std::string> tagsToWrite;  // -put: tags para escrever (bpm,energy,key)
-    bool putForce = false;                 // -putforce: sobrescrever álbum completamente
+    bool putForce = false;                 // -putforce: sobrescrever álbum completamente e ignorar caches de análise
     std::string coverPath;                 // -cover: caminho da imagem de capa
     bool removeCover = false;              // -cover-remove: remover imagem de capa
     bool removeAllTags = false;            // -remalltag: remover todas as tags
@@ -136,6 +159,7 @@ struct ProgramArgs
     bool listMode = false;                // -l: modo lista (sem análise)
     std::vector<std::string> listColumns; // Colunas para o modo lista
     bool meta = false;                    // -meta: gerar arquivos .analisemetadata
+    bool noCache = false;                 // -nocache: reanalisar tudo, ignorando os caches de análise
 
     // Ordenação
     std::vector<std::string> sortBy = {"name"}; // -sort: critérios de ordenação
@@ -192,6 +216,34 @@ std::string toLower(const std::string &str)
     return lower;
 }
 
+/**
+ * @brief Compara duas strings ignorando maiúsculas/minúsculas, sem alocar cópias
+ * @param a Primeira string
+ * @param b Segunda string
+ * @return true se forem iguais ignorando o caso
+ */
+bool equalsIgnoreCase(const std::string &a, const std::string &b)
+{
+    return a.size() == b.size() &&
+           std::equal(a.begin(), a.end(), b.begin(), [](char x, char y)
+                      { return ::tolower((unsigned char)x) == ::tolower((unsigned char)y); });
+}
+
+/**
+ * @brief Limpa o terminal
+ *
+ * Em sistemas POSIX escreve a sequência ANSI diretamente (a mesma que o
+ * comando clear emite), sem criar um processo de shell só para isso.
+ */
+void clearScreen()
+{
+#ifdef _WIN32
+    system("cls");
+#else
+    std::cout << "\033[H\033[2J\033[3J" << std::flush;
+#endif
+}
+
 /**
  * @brief Desenha uma barra de progresso animada no terminal
  * @param current Número de arquivos processados
@@ -202,30 +254,59 @@ std::string toLower(const std::string &str)
  * - Barra visual com blocos preenchidos (█) e vazios (░)
  * - Percentual de conclusão
  * - Nome do arquivo atual (truncado)
+ *
+ * Com milhares de arquivos rápidos, redesenhar a cada arquivo custa mais que
+ * o próprio trabalho: a barra só é redesenhada quando o percentual muda ou a
+ * cada 100 ms, e sempre no último arquivo. A linha é montada numa string e
+ * escrita de uma vez. Deve ser chamada com OUTPUT_MUTEX travado.
  */
 void drawProgressBar(int current, int total, const std::string &currentFile)
 {
-    if (IS_SILENT)
+    if (IS_SILENT || total <= 0)
         return;
 
     int barWidth = 20; // Largura da barra (otimizado para mobile)
     float progress = (float)current / total;
     int pos = barWidth * progress;
+    int percent = (int)(progress * 100.0);
+
+    // Estado do último desenho (protegido por OUTPUT_MUTEX, como a própria saída)
+    static int lastPercent = -1;
+    static std::chrono::steady_clock::time_point lastDraw;
+    auto now = std::chrono::steady_clock::now();
+    if (current < total && percent == lastPercent && now - lastDraw < std::chrono::milliseconds(100))
+        return;
+    lastPercent = percent;
+    lastDraw = now;
 
     // Desenha a barra com caracteres Unicode
-    std::cout << "\r" << CYAN << "[";
+    std::string line;
+    line.reserve(256);
+    line += "\r";
+    line += CYAN;
+    line += "[";
     for (int i = 0; i < barWidth; ++i)
     {
         if (i < pos)
-            std::cout << GREEN << "█"; // Bloco preenchido
+        {
+            line += GREEN;
+            line += "█"; // Bloco preenchido
+        }
         else
-            std::cout << DIM << "░"; // Bloco vazio
+        {
+            line += DIM;
+            line += "░"; // Bloco vazio
+        }
     }
-    std::cout << CYAN << "]" << RESET;
+    line += CYAN;
+    line += "]";
+    line += RESET;
 
     // Percentual e nome do arquivo
-    std::cout << " " << BOLD << GREEN << (int)(progress * 100.0) << "%" << RESET;
-    std::cout << " " << DIM << truncate(currentFile, 20) << RESET << std::flush;
+    line += " " + BOLD + GREEN + std::to_string(percent) + "%" + RESET;
+    line += " " + DIM + truncate(currentFile, 20) + RESET;
+
+    std::cout << line << std::flush;
 }
 
 /**
@@ -245,33 +326,33 @@ void log(const std::string &level, const std::string &message, const std::string
     if (IS_SILENT && level != "ERROR")
         return;
 
+    // Monta a linha inteira antes e escreve de uma vez. '\n' em vez de
+    // std::endl: o cout já é descarregado por linha no terminal e antes de
+    // cada escrita no cerr (tie), então o flush explícito era só custo
+    const bool isError = level == "ERROR";
+    std::string line;
+    line.reserve(message.size() + detail.size() + 24);
+
     // Ícones coloridos por nível
     if (level == "INFO")
-        std::cout << BLUE << "[i] " << RESET;
+        line += BLUE + "[i] " + RESET;
     else if (level == "WARNING")
-        std::cout << YELLOW << "[!] " << RESET;
-    else if (level == "ERROR")
-        std::cerr << RED << "[x] " << RESET;
+        line += YELLOW + "[!] " + RESET;
+    else if (isError)
+        line += RED + "[x] " + RESET;
     else if (level == "SUCCESS")
-        std::cout << GREEN << "[✓] " << RESET;
-
-    if (level == "ERROR")
-        std::cerr << message;
-    else
-        std::cout << message;
+        line += GREEN + "[✓] " + RESET;
 
+    line += message;
     if (!detail.empty())
     {
-        if (level == "ERROR")
-            std::cerr << " " << detail;
-        else
-            std::cout << " " << detail;
+        line += ' ';
+        line += detail;
     }
+    line += '\n';
 
-    if (level == "ERROR")
-        std::cerr << std::endl;
-    else
-        std::cout << std::endl;
+    std::lock_guard<std::mutex> lock(OUTPUT_MUTEX);
+    (isError ? std::cerr : std::cout) << line;
 }
 
 // ==============================
@@ -279,18 +360,28 @@ void log(const std::string &level, const std::string &message, const std::string
 // ==============================
 
 /**
- * @brief Escapa caracteres especiais em uma string para formato JSON
+ * @brief Escreve uma string JSON (entre aspas) direto no stream
+ * @param o Stream de saída
  * @param s String a ser escapada
- * @return String com caracteres especiais escapados
  *
  * Converte caracteres como aspas, barras invertidas e caracteres de controle
- * para suas representações escapadas em JSON (ex: " vira \")
+ * para suas representações escapadas em JSON (ex: " vira \"). Trechos sem
+ * escape são escritos de uma vez, sem string temporária.
  */
-std::string escapeJsonString(const std::string &s)
+void writeJsonString(std::ostream &o, const std::string &s)
 {
-    std::ostringstream o;
-    for (char c : s)
+    static const char hexDigits[] = "0123456789abcdef";
+
+    o.put('"');
+    size_t start = 0;
+    for (size_t i = 0; i < s.size(); ++i)
     {
+        const unsigned char c = (unsigned char)s[i];
+        if (c != '"' && c != '\\' && c > 0x1f)
+            continue;
+
+        o.write(s.data() + start, i - start);
+        start = i + 1;
         switch (c)
         {
         case '"':
@@ -315,17 +406,22 @@ std::string escapeJsonString(const std::string &s)
             o << "\\t";
             break;
         default:
-            if ('\x00' <= c && c <= '\x1f')
-            {
-                o << "\\u" << std::hex << std::setw(4) << std::setfill('0') << (int)c;
-            }
-            else
-            {
-                o << c;
-            }
+            o << "\\u00" << hexDigits[c >> 4] << hexDigits[c & 0xf];
         }
     }
-    return o.str();
+    o.write(s.data() + start, s.size() - start);
+    o.put('"');
+}
+
+/**
+ * @brief Caminho do arquivo .analisemetadata de um arquivo de áudio
+ * @param audioPath Caminho do arquivo de áudio
+ * @return audio.mp3 -> audio.mp3.analisemetadata (mesmo diretório)
+ */
+fs::path metadataPathFor(const std::string &audioPath)
+{
+    fs::path p(audioPath);
+    return p.parent_path() / (p.filename().string() + ".analisemetadata");
 }
 
 /**
@@ -341,9 +437,8 @@ void saveMetadataFile(const AudioAnalysis &data)
     if (data.path.empty())
         return;
 
-    fs::path p(data.path);
     // Cria o caminho do arquivo JSON: audio.mp3 -> audio.mp3.analisemetadata
-    fs::path jsonPath = p.parent_path() / (p.stem().string() + p.extension().string() + ".analisemetadata");
+    fs::path jsonPath = metadataPathFor(data.path);
 
     log("INFO", "Gerando meta: " + jsonPath.filename().string());
 
@@ -354,19 +449,95 @@ void saveMetadataFile(const AudioAnalysis &data)
         return;
     }
 
-    f << "{";
-    f << "\"file\":\"" << escapeJsonString(data.filename) << "\",";
-    f << "\"title\":\"" << escapeJsonString(data.title) << "\",";
-    f << "\"artist\":\"" << escapeJsonString(data.artist) << "\",";
-    f << "\"bpm\":" << std::fixed << std::setprecision(2) << data.bpm << ",";
-    f << "\"key\":\"" << escapeJsonString(data.keyCamelot) << "\",";
-    f << "\"energy\":" << std::fixed << std::setprecision(2) << data.energy << ",";
-    f << "\"len\":" << std::fixed << std::setprecision(1) << data.durationSec << ",";
-    f << "\"size\":" << std::fixed << std::setprecision(2) << data.fileSizeMB << ",";
-    f << "\"bitrate\":" << data.bitrate;
+    f << std::fixed << std::setprecision(2);
+    f << "{\"file\":";
+    writeJsonString(f, data.filename);
+    f << ",\"title\":";
+    writeJsonString(f, data.title);
+    f << ",\"artist\":";
+    writeJsonString(f, data.artist);
+    f << ",\"bpm\":" << data.bpm;
+    f << ",\"key\":";
+    writeJsonString(f, data.keyCamelot);
+    f << ",\"energy\":" << data.energy;
+    f << ",\"len\":" << std::setprecision(1) << data.durationSec << std::setprecision(2);
+    f << ",\"size\":" << data.fileSizeMB;
+    f << ",\"bitrate\":" << data.bitrate;
     f << "}";
 }
 
+/**
+ * @brief Extrai o valor bruto de um campo do JSON gerado por saveMetadataFile
+ * @param json Conteúdo do arquivo
+ * @param name Nome do campo
+ * @return Texto do valor (sem aspas para strings) ou "" se não existir
+ *
+ * Não é um parser JSON genérico: cobre apenas o formato plano que o próprio
+ * Amalyzer escreve.
+ */
+std::string metadataField(const std::string &json, const std::string &name)
+{
+    std::string needle = "\"" + name + "\":";
+    size_t pos = json.find(needle);
+    if (pos == std::string::npos)
+        return "";
+    pos += needle.size();
+
+    if (pos < json.size() && json[pos] == '"')
+    {
+        size_t end = json.find('"', pos + 1);
+        return end == std::string::npos ? "" : json.substr(pos + 1, end - pos - 1);
+    }
+    size_t end = json.find_first_of(",}", pos);
+    return end == std::string::npos ? "" : json.substr(pos, end - pos);
+}
+
+/**
+ * @brief Carrega a análise de um .analisemetadata gerado anteriormente
+ * @param res Resultado a preencher (usa res.path)
+ * @return true se o arquivo existe, é mais novo que o áudio e tem bpm/key/energy
+ *
+ * Permite pular a análise de bibliotecas já processadas com -meta.
+ */
+bool loadMetadataFile(AudioAnalysis &res)
+{
+    try
+    {
+        fs::path jsonPath = metadataPathFor(res.path);
+        std::error_code ec;
+        if (!fs::exists(jsonPath, ec))
+            return false;
+        // Áudio modificado depois do meta: o cache não é confiável
+        if (fs::last_write_time(jsonPath) < fs::last_write_time(res.path))
+            return false;
+
+        std::ifstream f(jsonPath);
+        if (!f.is_open())
+            return false;
+        std::stringstream buffer;
+        buffer << f.rdbuf();
+        std::string json = buffer.str();
+
+        std::string bpm = metadataField(json, "bpm");
+        std::string energy = metadataField(json, "energy");
+        std::string key = metadataField(json, "key");
+        if (bpm.empty() || energy.empty() || key.empty())
+            return false;
+
+        res.bpm = std::stod(bpm);
+        res.energy = std::stod(energy);
+        res.keyCamelot = key;
+        std::string len = metadataField(json, "len");
+        if (!len.empty())
+            res.durationSec = std::stod(len);
+        return true;
+    }
+    catch (...)
+    {
+        return false;
+    }
+}
+
 // ==============================
 // 🏷️ ESCRITA DE TAGS
 // ==============================
@@ -384,33 +555,154 @@ std::string cleanAlbumPrefix(const std::string &albumStr)
 {
     if (albumStr.empty())
         return "";
-    std::string temp = albumStr;
+    // Avança um offset sobre a string original; só copia o resto no final
+    size_t start = 0;
     int count = 0;
     while (count < 3)
     {
-        size_t pos = temp.find(" | ");
+        size_t pos = albumStr.find(" | ", start);
         if (pos == std::string::npos)
             break;
-        std::string prefix = temp.substr(0, pos);
-        bool isPrefix = false;
-        if (std::all_of(prefix.begin(), prefix.end(), [](char c)
-                        { return ::isalnum(c) || c == '.' || c == '#'; }))
-        {
-            isPrefix = true;
-        }
-        if (isPrefix)
-            temp = temp.substr(pos + 3);
-        else
+        bool isPrefix = std::all_of(albumStr.begin() + start, albumStr.begin() + pos, [](char c)
+                                    { return ::isalnum((unsigned char)c) || c == '.' || c == '#'; });
+        if (!isPrefix)
             break;
+        start = pos + 3;
         count++;
     }
-    return temp;
+    return albumStr.substr(start);
+}
+
+/**
+ * @brief Verifica se a string é uma key no formato Camelot (1A..12B)
+ */
+bool isCamelotKey(const std::string &key)
+{
+    if (key.size() < 2 || key.size() > 3 || (key.back() != 'A' && key.back() != 'B'))
+        return false;
+    return std::all_of(key.begin(), key.end() - 1, [](char c)
+                       { return ::isdigit((unsigned char)c); });
+}
+
+/**
+ * @brief Lê de volta o prefixo "BPM | Energy | Key" escrito por writeTags
+ * @param albumStr Campo álbum atual
+ * @param res Resultado a preencher com bpm, energy e keyCamelot
+ * @return true se o álbum começa com os três valores (ex: "128 | 0.27 | 8A | ...")
+ *
+ * O BPM volta arredondado para inteiro: o resultado não deve ser regravado
+ * como análise (-meta).
+ */
+bool parseAlbumPrefix(const std::string &albumStr, AudioAnalysis &res)
+{
+    std::string parts[3];
+    size_t start = 0;
+    for (int i = 0; i < 3; ++i)
+    {
+        size_t pos = albumStr.find(" | ", start);
+        if (pos == std::string::npos)
+        {
+            if (i < 2)
+                return false;
+            pos = albumStr.size(); // Álbum sem nome original: "128 | 0.27 | 8A"
+        }
+        parts[i] = albumStr.substr(start, pos - start);
+        start = pos + 3;
+    }
+
+    auto isNumber = [](const std::string &str, bool allowDot)
+    {
+        return !str.empty() && std::all_of(str.begin(), str.end(), [&](char c)
+                                           { return ::isdigit((unsigned char)c) || (allowDot && c == '.'); });
+    };
+
+    const std::string &key = parts[2];
+    if (!isNumber(parts[0], false) || !isNumber(parts[1], true) || !isCamelotKey(key))
+        return false;
+
+    try
+    {
+        res.bpm = std::stod(parts[0]);
+        res.energy = std::stod(parts[1]);
+        res.keyCamelot = key;
+    }
+    catch (...)
+    {
+        return false;
+    }
+    return true;
+}
+
+/**
+ * @brief Lê a análise das tags BPM, INITIALKEY e ENERGY escritas por writeTags
+ * @param properties Propriedades do arquivo (TBPM/TKEY/TXXX:ENERGY no ID3v2,
+ *                   BPM/INITIALKEY/ENERGY nos comentários Xiph)
+ * @param res Resultado a preencher com bpm, energy e keyCamelot
+ * @return true se as três tags existem e são válidas
+ */
+bool loadAnalysisTags(const TagLib::PropertyMap &properties, AudioAnalysis &res)
+{
+    auto firstValue = [&](const char *name) -> std::string
+    {
+        auto it = properties.find(name);
+        if (it == properties.end() || it->second.isEmpty())
+            return "";
+        return it->second.front().to8Bit(true);
+    };
+
+    std::string bpm = firstValue("BPM");
+    std::string energy = firstValue("ENERGY");
+    std::string key = firstValue("INITIALKEY");
+    if (bpm.empty() || energy.empty() || !isCamelotKey(key))
+        return false;
+
+    try
+    {
+        res.bpm = std::stod(bpm);
+        res.energy = std::stod(energy);
+        res.keyCamelot = key;
+    }
+    catch (...)
+    {
+        return false;
+    }
+    return res.bpm >= 0.1;
+}
+
+/**
+ * @brief Tags de análise pedidas em -put, resolvidas uma única vez
+ */
+struct TagSelection
+{
+    bool bpm = false;
+    bool energy = false;
+    bool key = false;
+
+    bool any() const { return bpm || energy || key; }
+};
+
+/**
+ * @brief Converte a lista de -put ("bpm", "energy", "key") em TagSelection
+ */
+TagSelection makeTagSelection(const std::vector<std::string> &tagsToWrite)
+{
+    TagSelection sel;
+    for (const auto &t : tagsToWrite)
+    {
+        if (t == "bpm")
+            sel.bpm = true;
+        else if (t == "energy")
+            sel.energy = true;
+        else if (t == "key")
+            sel.key = true;
+    }
+    return sel;
 }
 
 /**
  * @brief Escreve tags de análise (BPM, Energy, Key) nos arquivos de áudio
  * @param res Estrutura AudioAnalysis com os dados da análise
- * @param tagsToWrite Lista de tags para escrever ("bpm", "energy", "key")
+ * @param tagsToWrite Tags a escrever (bpm, energy, key), já resolvidas por makeTagSelection
  * @param force Se true, sobrescreve completamente o campo álbum; se false, preserva o álbum original
  *
  * Escreve as tags em dois locais:
@@ -423,9 +715,9 @@ std::string cleanAlbumPrefix(const std::string &albumStr)
 // 🏷️ ESCRITA DE TAGS (APENAS A FUNÇÃO writeTags MODIFICADA)
 // ==============================
 
-void writeTags(const AudioAnalysis &res, const std::vector<std::string> &tagsToWrite, bool force)
+void writeTags(const AudioAnalysis &res, const TagSelection &tagsToWrite, bool force)
 {
-    if (tagsToWrite.empty() || (res.bpm < 0.1 && res.energy < 0.01))
+    if (!tagsToWrite.any() || (res.bpm < 0.1 && res.energy < 0.01))
         return;
 
     std::stringstream bpmSs, energySs;
@@ -437,22 +729,22 @@ void writeTags(const AudioAnalysis &res, const std::vector<std::string> &tagsToW
     std::string keyStr = res.keyCamelot;
 
     std::vector<std::string> parts;
-    if (std::find(tagsToWrite.begin(), tagsToWrite.end(), "bpm") != tagsToWrite.end())
+    if (tagsToWrite.bpm)
         parts.push_back(bpmStr);
-    if (std::find(tagsToWrite.begin(), tagsToWrite.end(), "energy") != tagsToWrite.end())
+    if (tagsToWrite.energy)
         parts.push_back(energyStr);
-    if (std::find(tagsToWrite.begin(), tagsToWrite.end(), "key") != tagsToWrite.end())
+    if (tagsToWrite.key)
         parts.push_back(keyStr);
 
     if (parts.empty())
         return;
 
     std::string commentStr;
-    if (std::find(tagsToWrite.begin(), tagsToWrite.end(), "bpm") != tagsToWrite.end())
+    if (tagsToWrite.bpm)
         commentStr += "BPM: " + bpmStr + " | ";
-    if (std::find(tagsToWrite.begin(), tagsToWrite.end(), "key") != tagsToWrite.end())
+    if (tagsToWrite.key)
         commentStr += "Key: " + keyStr + " | ";
-    if (std::find(tagsToWrite.begin(), tagsToWrite.end(), "energy") != tagsToWrite.end())
+    if (tagsToWrite.energy)
         commentStr += "Energy: " + energyStr + " | ";
     if (commentStr.length() > 3)
         commentStr = commentStr.substr(0, commentStr.length() - 3);
@@ -521,15 +813,15 @@ void writeTags(const AudioAnalysis &res, const std::vector<std::string> &tagsToW
                 return t.toCString(TagLib::String::UTF16) == expected;
             };
 
-            if (std::find(tagsToWrite.begin(), tagsToWrite.end(), "bpm") != tagsToWrite.end())
+            if (tagsToWrite.bpm)
                 if (!eqText("TBPM", bpmStr))
                     needsSave = true;
 
-            if (std::find(tagsToWrite.begin(), tagsToWrite.end(), "key") != tagsToWrite.end())
+            if (tagsToWrite.key)
                 if (!eqText("TKEY", keyStr))
                     needsSave = true;
 
-            if (std::find(tagsToWrite.begin(), tagsToWrite.end(), "energy") != tagsToWrite.end())
+            if (tagsToWrite.energy)
             {
                 bool found = false;
                 TagLib::ID3v2::FrameList txxxFrames = id3->frameList("TXXX");
@@ -582,15 +874,15 @@ void writeTags(const AudioAnalysis &res, const std::vector<std::string> &tagsToW
                 return ogg->fieldListMap()[key].toString().toCString(true) == expected;
             };
 
-            if (std::find(tagsToWrite.begin(), tagsToWrite.end(), "bpm") != tagsToWrite.end())
+            if (tagsToWrite.bpm)
                 if (!eqField("BPM", bpmStr))
                     needsSave = true;
 
-            if (std::find(tagsToWrite.begin(), tagsToWrite.end(), "key") != tagsToWrite.end())
+            if (tagsToWrite.key)
                 if (!eqField("INITIALKEY", keyStr))
                     needsSave = true;
 
-            if (std::find(tagsToWrite.begin(), tagsToWrite.end(), "energy") != tagsToWrite.end())
+            if (tagsToWrite.energy)
                 if (!eqField("ENERGY", energyStr))
                     needsSave = true;
 
@@ -613,7 +905,7 @@ void writeTags(const AudioAnalysis &res, const std::vector<std::string> &tagsToW
             // A Codificação UTF16 ajuda na compatibilidade de leitura em apps mais restritivos
             const TagLib::String::Type TEXT_ENCODING = TagLib::String::UTF16;
 
-            if (std::find(tagsToWrite.begin(), tagsToWrite.end(), "bpm") != tagsToWrite.end())
+            if (tagsToWrite.bpm)
             {
                 TagLib::ByteVector id("TBPM");
                 id3->removeFrames(id);
@@ -622,7 +914,7 @@ void writeTags(const AudioAnalysis &res, const std::vector<std::string> &tagsToW
                 id3->addFrame(frame);
             }
 
-            if (std::find(tagsToWrite.begin(), tagsToWrite.end(), "key") != tagsToWrite.end())
+            if (tagsToWrite.key)
             {
                 TagLib::ByteVector id("TKEY");
                 id3->removeFrames(id);
@@ -631,7 +923,7 @@ void writeTags(const AudioAnalysis &res, const std::vector<std::string> &tagsToW
                 id3->addFrame(frame);
             }
 
-            if (std::find(tagsToWrite.begin(), tagsToWrite.end(), "energy") != tagsToWrite.end())
+            if (tagsToWrite.energy)
             {
                 TagLib::ID3v2::FrameList txxxFrames = id3->frameList("TXXX");
                 std::vector<TagLib::ID3v2::Frame *> rem;
@@ -670,11 +962,11 @@ void writeTags(const AudioAnalysis &res, const std::vector<std::string> &tagsToW
         }
         else if (TagLib::Ogg::XiphComment *ogg = dynamic_cast<TagLib::Ogg::XiphComment *>(tag))
         {
-            if (std::find(tagsToWrite.begin(), tagsToWrite.end(), "bpm") != tagsToWrite.end())
+            if (tagsToWrite.bpm)
                 ogg->addField("BPM", TagLib::String(bpmStr, TagLib::String::UTF8), true);
-            if (std::find(tagsToWrite.begin(), tagsToWrite.end(), "key") != tagsToWrite.end())
+            if (tagsToWrite.key)
                 ogg->addField("INITIALKEY", TagLib::String(keyStr, TagLib::String::UTF8), true);
-            if (std::find(tagsToWrite.begin(), tagsToWrite.end(), "energy") != tagsToWrite.end())
+            if (tagsToWrite.energy)
                 ogg->addField("ENERGY", TagLib::String(energyStr, TagLib::String::UTF8), true);
 
             ogg->addField("COMMENT", TagLib::String(commentStr, TagLib::String::UTF8), true);
@@ -692,41 +984,70 @@ void writeTags(const AudioAnalysis &res, const std::vector<std::string> &tagsToW
 }
 
 /**
- * @brief Embutir imagem de capa no arquivo de áudio
- * @param audioPath Caminho do arquivo de áudio
- * @param imagePath Caminho do arquivo de imagem
+ * @struct CoverImage
+ * @brief Imagem de capa carregada uma única vez e compartilhada entre os arquivos
+ *
+ * TagLib::ByteVector é compartilhado implicitamente (copy-on-write), então
+ * entregar os mesmos bytes a cada arquivo não copia a imagem.
  */
-void embedCover(const std::string &audioPath, const std::string &imagePath)
+struct CoverImage
+{
+    TagLib::ByteVector data;
+    std::string mimeType = "image/jpeg";
+    TagLib::MP4::CoverArt::Format mp4Format = TagLib::MP4::CoverArt::JPEG;
+};
+
+/**
+ * @brief Lê o arquivo de imagem de capa e detecta seu formato
+ * @param imagePath Caminho do arquivo de imagem (jpg/png)
+ * @param cover Estrutura a preencher
+ * @return true se a imagem foi lida
+ */
+bool loadCoverImage(const std::string &imagePath, CoverImage &cover)
 {
     if (!fs::exists(imagePath))
     {
         log("ERROR", "Imagem não encontrada", imagePath);
-        return;
+        return false;
+    }
+
+    // Lê o arquivo de imagem
+    std::ifstream imgFile(imagePath, std::ios::binary | std::ios::ate);
+    if (!imgFile.is_open())
+    {
+        log("ERROR", "Erro ao ler imagem", imagePath);
+        return false;
     }
+    std::streamsize size = imgFile.tellg();
+    imgFile.seekg(0, std::ios::beg);
+    cover.data = TagLib::ByteVector((unsigned int)size, 0);
+    imgFile.read(cover.data.data(), size);
 
+    // Detecta formato da imagem
+    if (imagePath.length() > 4 && toLower(imagePath.substr(imagePath.length() - 4)) == ".png")
+    {
+        cover.mp4Format = TagLib::MP4::CoverArt::PNG;
+        cover.mimeType = "image/png";
+    }
+    return true;
+}
+
+/**
+ * @brief Embutir imagem de capa no arquivo de áudio
+ * @param res Resultado do arquivo (usa path e filename)
+ * @param cover Imagem já carregada por loadCoverImage
+ */
+void embedCover(const AudioAnalysis &res, const CoverImage &cover)
+{
     try
     {
-        TagLib::FileRef f(audioPath.c_str());
+        TagLib::FileRef f(res.path.c_str());
         if (f.isNull() || !f.file())
             return;
 
-        // Lê o arquivo de imagem
-        std::ifstream imgFile(imagePath, std::ios::binary | std::ios::ate);
-        if (!imgFile.is_open())
-            return;
-        std::streamsize size = imgFile.tellg();
-        imgFile.seekg(0, std::ios::beg);
-        TagLib::ByteVector imgData((unsigned int)size, 0);
-        imgFile.read(imgData.data(), size);
-
-        // Detecta formato da imagem
-        TagLib::MP4::CoverArt::Format mp4Format = TagLib::MP4::CoverArt::JPEG;
-        std::string mimeType = "image/jpeg";
-        if (imagePath.length() > 4 && toLower(imagePath.substr(imagePath.length() - 4)) == ".png")
-        {
-            mp4Format = TagLib::MP4::CoverArt::PNG;
-            mimeType = "image/png";
-        }
+        const TagLib::ByteVector &imgData = cover.data;
+        const std::string &mimeType = cover.mimeType;
+        const TagLib::MP4::CoverArt::Format mp4Format = cover.mp4Format;
 
         bool saved = false;
 
@@ -832,12 +1153,12 @@ void embedCover(const std::string &audioPath, const std::string &imagePath)
 
         if (saved)
         {
-            log("SUCCESS", "Capa adicionada", fs::path(audioPath).filename().string());
+            log("SUCCESS", "Capa adicionada", res.filename);
         }
         else
         {
             // Se não entrou em nenhum bloco específico ou falhou ao salvar
-            log("WARNING", "Formato não suportado ou falha ao salvar", fs::path(audioPath).filename().string());
+            log("WARNING", "Formato não suportado ou falha ao salvar", res.filename);
         }
     }
     catch (const std::exception &e)
@@ -848,13 +1169,13 @@ void embedCover(const std::string &audioPath, const std::string &imagePath)
 
 /**
  * @brief Remove a imagem de capa do arquivo de áudio
- * @param audioPath Caminho do arquivo de áudio
+ * @param res Resultado do arquivo (usa path e filename)
  */
-void removeCover(const std::string &audioPath)
+void removeCover(const AudioAnalysis &res)
 {
     try
     {
-        TagLib::FileRef f(audioPath.c_str());
+        TagLib::FileRef f(res.path.c_str());
         if (f.isNull() || !f.file())
             return;
 
@@ -935,12 +1256,12 @@ void removeCover(const std::string &audioPath)
 
         if (saved)
         {
-            log("SUCCESS", "Capa removida", fs::path(audioPath).filename().string());
+            log("SUCCESS", "Capa removida", res.filename);
         }
         else
         {
             // Se não tinha capa ou falhou
-            // log("INFO", "Sem capa para remover ou falha", fs::path(audioPath).filename().string());
+            // log("INFO", "Sem capa para remover ou falha", res.filename);
         }
     }
     catch (const std::exception &e)
@@ -951,14 +1272,14 @@ void removeCover(const std::string &audioPath)
 
 /**
  * @brief Remove tags específicas do arquivo de áudio
- * @param audioPath Caminho do arquivo
+ * @param res Resultado do arquivo (usa path e filename)
  * @param tags Lista de tags para remover (artist, album, title, etc)
  */
-void removeTags(const std::string &audioPath, const std::vector<std::string> &tags)
+void removeTags(const AudioAnalysis &res, const std::vector<std::string> &tags)
 {
     try
     {
-        TagLib::FileRef f(audioPath.c_str());
+        TagLib::FileRef f(res.path.c_str());
         if (f.isNull() || !f.tag())
             return;
 
@@ -992,37 +1313,38 @@ void removeTags(const std::string &audioPath, const std::vector<std::string> &ta
                 // Fallback para métodos set padrão se PropertyMap não funcionar ou não encontrar
                 // (Embora PropertyMap deva cobrir tudo em formatos modernos)
                 std::string lowerT = toLower(t);
-                if (lowerT == "artist")
+                // Só marca como modificado se havia algo: salvar reescreve o arquivo
+                if (lowerT == "artist" && !tag->artist().isEmpty())
                 {
                     tag->setArtist("");
                     modified = true;
                 }
-                else if (lowerT == "album")
+                else if (lowerT == "album" && !tag->album().isEmpty())
                 {
                     tag->setAlbum("");
                     modified = true;
                 }
-                else if (lowerT == "title")
+                else if (lowerT == "title" && !tag->title().isEmpty())
                 {
                     tag->setTitle("");
                     modified = true;
                 }
-                else if (lowerT == "comment")
+                else if (lowerT == "comment" && !tag->comment().isEmpty())
                 {
                     tag->setComment("");
                     modified = true;
                 }
-                else if (lowerT == "genre")
+                else if (lowerT == "genre" && !tag->genre().isEmpty())
                 {
                     tag->setGenre("");
                     modified = true;
                 }
-                else if (lowerT == "year")
+                else if (lowerT == "year" && tag->year() != 0)
                 {
                     tag->setYear(0);
                     modified = true;
                 }
-                else if (lowerT == "track")
+                else if (lowerT == "track" && tag->track() != 0)
                 {
                     tag->setTrack(0);
                     modified = true;
@@ -1037,16 +1359,16 @@ void removeTags(const std::string &audioPath, const std::vector<std::string> &ta
 
             if (f.save())
             {
-                log("SUCCESS", "Tags removidas", fs::path(audioPath).filename().string());
+                log("SUCCESS", "Tags removidas", res.filename);
             }
             else
             {
-                log("ERROR", "Falha ao salvar tags removidas", fs::path(audioPath).filename().string());
+                log("ERROR", "Falha ao salvar tags removidas", res.filename);
             }
         }
         else
         {
-            // log("INFO", "Nenhuma tag encontrada para remover", fs::path(audioPath).filename().string());
+            // log("INFO", "Nenhuma tag encontrada para remover", res.filename);
         }
     }
     catch (const std::exception &e)
@@ -1057,16 +1379,16 @@ void removeTags(const std::string &audioPath, const std::vector<std::string> &ta
 
 /**
  * @brief Remove TODAS as tags do arquivo de áudio
- * @param audioPath Caminho do arquivo
+ * @param res Resultado do arquivo (usa path e filename)
  */
-void removeAllTags(const std::string &audioPath)
+void removeAllTags(const AudioAnalysis &res)
 {
     try
     {
         // Tenta usar TagLib::File::strip() se possível, mas FileRef não expõe diretamente de forma fácil para todos os tipos
         // Uma abordagem genérica segura é limpar os campos padrão
 
-        TagLib::FileRef f(audioPath.c_str());
+        TagLib::FileRef f(res.path.c_str());
         if (f.isNull() || !f.tag())
             return;
 
@@ -1098,7 +1420,7 @@ void removeAllTags(const std::string &audioPath)
                 mpegFile->strip(TagLib::MPEG::File::AllTags);
                 // Nota: strip salva automaticamente? Geralmente sim ou precisa de save().
                 // TagLib::File::strip() usually saves.
-                log("SUCCESS", "Todas as tags removidas (strip)", fs::path(audioPath).filename().string());
+                log("SUCCESS", "Todas as tags removidas (strip)", res.filename);
                 return;
             }
         }
@@ -1106,7 +1428,7 @@ void removeAllTags(const std::string &audioPath)
         // Fallback para outros formatos: apenas salva com campos vazios
         if (f.save())
         {
-            log("SUCCESS", "Tags limpas", fs::path(audioPath).filename().string());
+            log("SUCCESS", "Tags limpas", res.filename);
         }
     }
     catch (const std::exception &e)
@@ -1117,18 +1439,19 @@ void removeAllTags(const std::string &audioPath)
 
 /**
  * @brief Aplica operações de edição de tags (Set, Append, Prepend)
- * @param audioPath Caminho do arquivo
+ * @param res Resultado do arquivo (usa path e filename)
  * @param ops Lista de operações
  */
-void applyTagOperations(const std::string &audioPath, const std::vector<TagOperation> &ops)
+void applyTagOperations(const AudioAnalysis &res, const std::vector<TagOperation> &ops)
 {
     try
     {
-        TagLib::FileRef f(audioPath.c_str());
+        TagLib::FileRef f(res.path.c_str());
         if (f.isNull() || !f.file())
             return;
 
-        TagLib::PropertyMap properties = f.file()->properties();
+        const TagLib::PropertyMap original = f.file()->properties();
+        TagLib::PropertyMap properties = original;
         bool modified = false;
 
         for (const auto &op : ops)
@@ -1203,16 +1526,20 @@ void applyTagOperations(const std::string &audioPath, const std::vector<TagOpera
             }
         }
 
+        // Valores já iguais (ex: -settag repetido): não reescreve o arquivo
+        if (modified && properties == original)
+            modified = false;
+
         if (modified)
         {
             f.file()->setProperties(properties);
             if (f.save())
             {
-                log("SUCCESS", "Tags atualizadas", fs::path(audioPath).filename().string());
+                log("SUCCESS", "Tags atualizadas", res.filename);
             }
             else
             {
-                log("ERROR", "Falha ao salvar tags atualizadas", fs::path(audioPath).filename().string());
+                log("ERROR", "Falha ao salvar tags atualizadas", res.filename);
             }
         }
     }
@@ -1229,57 +1556,107 @@ void applyTagOperations(const std::string &audioPath, const std::vector<TagOpera
 /**
  * @brief Busca arquivos de áudio em um diretório ou adiciona um arquivo específico
  * @param root Caminho do arquivo ou diretório raiz
- * @param files Vetor onde os caminhos dos arquivos encontrados serão adicionados
- * @param args Argumentos do programa (contém extensões permitidas e flag recursivo)
+ * @param args Argumentos do programa (extensões, flag recursivo, tamanho e limite)
+ * @param found Total de arquivos aceitos até agora (somado entre as raízes, para -limit)
+ * @param onFile Chamada para cada arquivo aceito, com o caminho e o tamanho em bytes
  *
  * Se root for um arquivo, adiciona-o à lista se tiver extensão válida.
  * Se root for um diretório, busca arquivos com extensões válidas:
  * - Modo recursivo (-r): busca em todos os subdiretórios
  * - Modo normal: busca apenas no diretório especificado
+ *
+ * Um único laço percorre o diretório; o tipo vem da própria entrada (d_type),
+ * sem stat extra por arquivo. Os filtros -ext, -size-min e -size-max são
+ * aplicados aqui, antes de qualquer análise, e -limit conta apenas os arquivos
+ * aceitos; a busca para assim que ele é atingido.
+ *
+ * Os arquivos são entregues a onFile assim que encontrados, o que permite
+ * processá-los enquanto a busca continua (modo lista).
  */
-void findFiles(const fs::path &root, std::vector<std::string> &files, const ProgramArgs &args)
+void findFiles(const fs::path &root, const ProgramArgs &args, size_t &found,
+               const std::function<void(std::string &&, uintmax_t)> &onFile)
 {
+    // Compara o fim do caminho com cada extensão (já em minúsculas, com o ponto)
+    // direto sobre a string nativa: sem extension(), cópias ou toLower por entrada
+    auto hasValidExtension = [&](const fs::path &p)
+    {
+        const auto &name = p.native();
+        for (const auto &ext : args.extensions)
+        {
+            if (name.size() <= ext.size())
+                continue;
+            size_t start = name.size() - ext.size();
+            // "pasta/.mp3" é um arquivo oculto sem extensão
+            if (name[start - 1] == '/' || name[start - 1] == '\\')
+                continue;
+            bool match = true;
+            for (size_t i = 0; i < ext.size() && match; ++i)
+            {
+                auto c = name[start + i];
+                if (c >= 'A' && c <= 'Z')
+                    c = c - 'A' + 'a';
+                match = c == ext[i];
+            }
+            if (match)
+                return true;
+        }
+        return false;
+    };
+    auto limitReached = [&]()
+    {
+        return args.limit > 0 && found >= (size_t)args.limit;
+    };
+    // Obtém o tamanho (um stat, só para extensões válidas) e aplica o filtro de tamanho
+    auto addIfSizeMatches = [&](const fs::path &p)
+    {
+        std::error_code ec;
+        uintmax_t sz = fs::file_size(p, ec);
+        if (ec)
+            sz = 0;
+
+        double sizeMB = (double)sz / (1024.0 * 1024.0);
+        if (args.minSizeMB > 0 && sizeMB < args.minSizeMB)
+            return;
+        if (args.maxSizeMB > 0 && sizeMB > args.maxSizeMB)
+            return;
+
+        ++found;
+        onFile(p.string(), sz);
+    };
+
+    if (limitReached())
+        return;
+
     try
     {
-        if (fs::is_regular_file(root))
+        fs::file_status status = fs::status(root);
+
+        if (fs::is_regular_file(status))
         {
-            std::string ext = toLower(root.extension().string());
-            if (std::find(args.extensions.begin(), args.extensions.end(), ext) != args.extensions.end())
+            if (hasValidExtension(root))
             {
-                files.push_back(root.string());
+                addIfSizeMatches(root);
             }
             return;
         }
 
-        if (fs::is_directory(root))
+        if (!fs::is_directory(status))
+            return;
+
+        // Sem -r, não desce em subdiretórios
+        for (auto it = fs::recursive_directory_iterator(root, fs::directory_options::skip_permission_denied);
+             it != fs::recursive_directory_iterator(); ++it)
         {
-            if (args.recursive)
+            if (!args.recursive)
+                it.disable_recursion_pending();
+
+            // Extensão primeiro (só string): o tipo só é consultado para candidatos,
+            // e pode exigir um stat (symlinks ou sistemas de arquivos sem d_type)
+            if (hasValidExtension(it->path()) && it->is_regular_file())
             {
-                for (const auto &entry : fs::recursive_directory_iterator(root))
-                {
-                    if (entry.is_regular_file())
-                    {
-                        std::string ext = toLower(entry.path().extension().string());
-                        if (std::find(args.extensions.begin(), args.extensions.end(), ext) != args.extensions.end())
-                        {
-                            files.push_back(entry.path().string());
-                        }
-                    }
-                }
-            }
-            else
-            {
-                for (const auto &entry : fs::directory_iterator(root))
-                {
-                    if (entry.is_regular_file())
-                    {
-                        std::string ext = toLower(entry.path().extension().string());
-                        if (std::find(args.extensions.begin(), args.extensions.end(), ext) != args.extensions.end())
-                        {
-                            files.push_back(entry.path().string());
-                        }
-                    }
-                }
+                addIfSizeMatches(it->path());
+                if (limitReached())
+                    break;
             }
         }
     }
@@ -1287,6 +1664,305 @@ void findFiles(const fs::path &root, std::vector<std::string> &files, const Prog
     {
         log("ERROR", "Erro scan: " + std::string(e.what()));
     }
+    catch (...)
+    {
+        // No modo lista a busca roda numa thread própria: nada pode escapar dela
+        log("ERROR", "Erro scan: exceção desconhecida", root.string());
+    }
+}
+
+// ==============================
+// ⚙️ PROCESSAMENTO
+// ==============================
+
+/**
+ * @brief Número de núcleos que o processo pode de fato usar
+ * @return Núcleos disponíveis (4 se não for possível descobrir)
+ *
+ * No Linux/Android respeita a máscara de afinidade (taskset, cpuset de
+ * contêineres): hardware_concurrency() conta todos os núcleos da máquina e
+ * criaria workers demais num contêiner limitado a poucos núcleos.
+ */
+unsigned int availableCores()
+{
+#ifdef __linux__
+    cpu_set_t set;
+    CPU_ZERO(&set);
+    if (sched_getaffinity(0, sizeof(set), &set) == 0)
+    {
+        int count = CPU_COUNT(&set);
+        if (count > 0)
+            return (unsigned int)count;
+    }
+#endif
+    unsigned int count = std::thread::hardware_concurrency();
+    return count == 0 ? 4 : count;
+}
+
+/**
+ * @brief Pool de workers persistente, reaproveitado por todas as etapas
+ *
+ * As threads são criadas uma única vez e ficam aguardando novas tarefas, em vez
+ * de serem criadas e destruídas a cada etapa (análise, escrita de tags, ...).
+ * A thread que chama run() também trabalha, como worker 0.
+ */
+class WorkerPool
+{
+public:
+    /**
+     * @param workerCount Número total de workers, incluindo a thread chamadora
+     */
+    explicit WorkerPool(unsigned int workerCount)
+        : workerCount_(std::max(1u, workerCount))
+    {
+        for (unsigned int w = 1; w < workerCount_; ++w)
+            threads_.emplace_back([this, w]()
+                                  { threadLoop(w, 0); });
+    }
+
+    ~WorkerPool()
+    {
+        {
+            std::lock_guard<std::mutex> lock(mutex_);
+            stopping_ = true;
+        }
+        wake_.notify_all();
+        for (auto &t : threads_)
+            t.join();
+    }
+
+    WorkerPool(const WorkerPool &) = delete;
+    WorkerPool &operator=(const WorkerPool &) = delete;
+
+    unsigned int size() const { return workerCount_.load(); }
+
+    /**
+     * @brief Aumenta o pool até workerCount workers (nunca diminui)
+     *
+     * Pode ser chamado de outra thread durante um run(): as threads novas
+     * entram no trabalho em andamento e pegam os índices que ainda restam.
+     */
+    void grow(unsigned int workerCount)
+    {
+        std::lock_guard<std::mutex> lock(mutex_);
+        while (workerCount_ < workerCount)
+        {
+            unsigned int w = workerCount_++;
+            unsigned long long seen = generation_;
+            if (task_)
+            {
+                // Geração "já vista" anterior à atual: a thread entra neste run()
+                --seen;
+                ++busy_;
+            }
+            threads_.emplace_back([this, w, seen]()
+                                  { threadLoop(w, seen); });
+        }
+    }
+
+    /**
+     * @brief Executa task(worker, índice) para todos os índices em [0, count)
+     * @param count Número de itens
+     * @param chunkSize Itens retirados por vez do contador compartilhado
+     * @param task Função chamada com o id do worker (0..size()-1) e o índice
+     *
+     * Retorna quando todos os itens foram processados.
+     */
+    void run(size_t count, size_t chunkSize, const std::function<void(unsigned int, size_t)> &task)
+    {
+        if (count == 0)
+            return;
+
+        {
+            std::lock_guard<std::mutex> lock(mutex_);
+            task_ = &task;
+            count_ = count;
+            chunkSize_ = std::max<size_t>(1, chunkSize);
+            next_.store(0);
+            busy_ = workerCount_ - 1;
+            ++generation_;
+        }
+        wake_.notify_all();
+
+        work(0);
+
+        std::unique_lock<std::mutex> lock(mutex_);
+        done_.wait(lock, [this]
+                   { return busy_ == 0; });
+        task_ = nullptr;
+    }
+
+private:
+    void threadLoop(unsigned int worker, unsigned long long seen)
+    {
+        while (true)
+        {
+            {
+                std::unique_lock<std::mutex> lock(mutex_);
+                wake_.wait(lock, [&]
+                           { return stopping_ || generation_ != seen; });
+                if (stopping_)
+                    return;
+                seen = generation_;
+            }
+
+            work(worker);
+
+            {
+                std::lock_guard<std::mutex> lock(mutex_);
+                --busy_;
+            }
+            done_.notify_one();
+        }
+    }
+
+    void work(unsigned int worker)
+    {
+        while (true)
+        {
+            size_t begin = next_.fetch_add(chunkSize_);
+            if (begin >= count_)
+                break;
+            size_t end = std::min(begin + chunkSize_, count_);
+            for (size_t i = begin; i < end; ++i)
+                (*task_)(worker, i);
+        }
+    }
+
+    std::atomic<unsigned int> workerCount_;
+    std::vector<std::thread> threads_;
+
+    std::mutex mutex_;
+    std::condition_variable wake_;
+    std::condition_variable done_;
+    bool stopping_ = false;
+    unsigned long long generation_ = 0;
+    unsigned int busy_ = 0;
+
+    const std::function<void(unsigned int, size_t)> *task_ = nullptr;
+    size_t count_ = 0;
+    size_t chunkSize_ = 1;
+    std::atomic<size_t> next_{0};
+};
+
+/**
+ * @brief Pede ao kernel para começar a ler um arquivo em segundo plano
+ * @param path Arquivo que será decodificado em seguida
+ *
+ * O decoder lê o arquivo inteiro de forma síncrona; avisar antes
+ * (POSIX_FADV_WILLNEED, que age sobre o cache de páginas e vale para
+ * qualquer descritor aberto depois) faz o disco trabalhar enquanto o worker
+ * ainda analisa o arquivo atual. Sem efeito fora do Linux/Android.
+ */
+void prefetchFile(const std::string &path)
+{
+#ifdef __linux__
+    int fd = open(path.c_str(), O_RDONLY | O_CLOEXEC);
+    if (fd < 0)
+        return;
+    posix_fadvise(fd, 0, 0, POSIX_FADV_WILLNEED);
+    close(fd);
+#else
+    (void)path;
+#endif
+}
+
+/**
+ * @brief Lê metadados e (fora do modo lista) analisa um arquivo de áudio
+ * @param fpath Caminho do arquivo
+ * @param sizeBytes Tamanho já obtido pelo despachante (evita um stat por arquivo)
+ * @param args Argumentos do programa
+ * @param amalyzer Analisador do worker atual (uma instância por thread)
+ * @param decoded Se informado, recebe true quando o áudio foi de fato decodificado
+ *                (false no modo lista ou quando a análise veio de cache)
+ * @return AudioAnalysis com metadados, análise e status
+ */
+AudioAnalysis processFile(const std::string &fpath, uintmax_t sizeBytes, const ProgramArgs &args, Amalyzer &amalyzer,
+                          bool *decoded = nullptr)
+{
+    if (decoded)
+        *decoded = false;
+
+    AudioAnalysis res;
+    res.path = fpath;
+    // Nome extraído direto da string, sem montar um fs::path
+    size_t lastSlash = fpath.find_last_of("/\\");
+    res.filename = lastSlash == std::string::npos ? fpath : fpath.substr(lastSlash + 1);
+    res.fileSizeMB = (double)sizeBytes / (1024.0 * 1024.0);
+
+    // Tags BPM/key/energy e o prefixo do álbum (escritos por -put) guardam o
+    // BPM arredondado para inteiro: servem de cache para exibir e filtrar, mas
+    // não com -meta, que gravaria esse valor no .analisemetadata como se fosse
+    // uma análise real (só o .analisemetadata tem precisão total)
+    // -put-force e -nocache ignoram todos os caches (tags, .analisemetadata e álbum) e recalculam
+    const bool useCache = !args.listMode && !args.putForce && !args.noCache;
+    const bool useLossyCache = useCache && !args.meta;
+
+    // Tags BPM/key/energy já presentes só dispensam a análise quando -put vai
+    // gravar esses mesmos campos: numa leitura simples elas podem ter vindo
+    // de outro programa e não devem alimentar tabela, filtros e CSV
+    const bool useTagCache = useLossyCache && !args.tagsToWrite.empty();
+    bool analysisFromTags = false;
+
+    // Lê metadados básicos usando TagLib (título, artista, álbum, etc)
+    // ReadStyle Fast: lê o mínimo do arquivo; só precisamos de tags e cabeçalho
+    try
+    {
+        TagLib::FileRef f(fpath.c_str(), true, TagLib::AudioProperties::Fast);
+        if (!f.isNull() && f.tag())
+        {
+            if (useTagCache)
+                analysisFromTags = loadAnalysisTags(f.file()->properties(), res);
+
+            res.title = f.tag()->title().toCString(true);
+            res.artist = f.tag()->artist().toCString(true);
+            res.album = f.tag()->album().toCString(true);
+            res.genre = f.tag()->genre().toCString(true);
+            res.year = f.tag()->year();
+            res.track = f.tag()->track();
+            if (f.audioProperties())
+            {
+                res.bitrate = f.audioProperties()->bitrate();
+                res.sampleRate = f.audioProperties()->sampleRate();
+                res.channels = f.audioProperties()->channels();
+                res.durationSec = f.audioProperties()->lengthInSeconds();
+            }
+        }
+    }
+    catch (...)
+    {
+    }
+
+    // Realiza análise de áudio (BPM, Energy, Key) se não estiver em modo lista
+    if (!args.listMode)
+    {
+        // Arquivo já analisado antes (tags, .analisemetadata ou prefixo no álbum): reaproveita
+        if (analysisFromTags || (useCache && loadMetadataFile(res)) || (useLossyCache && parseAlbumPrefix(res.album, res)))
+        {
+            res.success = true;
+            return res;
+        }
+
+        // Perform Audio Analysis (preenche res diretamente, sem struct temporária)
+        // Exceções viram erro no próprio resultado: nada escapa da thread do worker
+        if (decoded)
+            *decoded = true;
+        try
+        {
+            amalyzer.analyzeInto(fpath, res);
+        }
+        catch (const std::exception &e)
+        {
+            res.success = false;
+            res.errorMessage = e.what();
+        }
+    }
+    else
+    {
+        res.success = true;
+    }
+
+    return res;
 }
 
 // ==============================
@@ -1324,98 +2000,121 @@ void printTable(std::vector<AudioAnalysis> &results, const ProgramArgs &args, Co
             columns = {"name", "artist", "album", "size"};
         }
 
+        // Resolve nome e largura de cada coluna uma única vez (e não por célula)
+        enum class ListColumn
+        {
+            Name, Artist, Album, Title, Genre, Year, Track,
+            Bpm, Key, Energy, Size, Duration, Bitrate, Samplerate
+        };
+        struct ColumnSpec
+        {
+            ListColumn id;
+            int width;
+        };
+
+        std::vector<ColumnSpec> specs;
+        specs.reserve(columns.size());
+        for (const auto &column : columns)
+        {
+            std::string col = toLower(column);
+            if (col == "name" || col == "filename")
+                specs.push_back({ListColumn::Name, config.getInt("name_w", 25)});
+            else if (col == "artist")
+                specs.push_back({ListColumn::Artist, config.getInt("artist_w", 15)});
+            else if (col == "album")
+                specs.push_back({ListColumn::Album, config.getInt("album_w", 20)});
+            else if (col == "title")
+                specs.push_back({ListColumn::Title, config.getInt("title_w", 20)});
+            else if (col == "genre")
+                specs.push_back({ListColumn::Genre, config.getInt("genre_w", 10)});
+            else if (col == "year")
+                specs.push_back({ListColumn::Year, config.getInt("year_w", 4)});
+            else if (col == "track")
+                specs.push_back({ListColumn::Track, config.getInt("track_w", 2)});
+            else if (col == "bpm")
+                specs.push_back({ListColumn::Bpm, config.getInt("bpm_w", 3)});
+            else if (col == "key")
+                specs.push_back({ListColumn::Key, config.getInt("key_w", 3)});
+            else if (col == "energy")
+                specs.push_back({ListColumn::Energy, config.getInt("energy_w", 3)});
+            else if (col == "size")
+                specs.push_back({ListColumn::Size, config.getInt("size_w", 4)});
+            else if (col == "duration")
+                // Duration format is fixed (MM:SS), so width is essentially fixed or minimum 5
+                specs.push_back({ListColumn::Duration, config.getInt("duration_w", 5)});
+            else if (col == "bitrate")
+                specs.push_back({ListColumn::Bitrate, config.getInt("bitrate_w", 3)});
+            else if (col == "samplerate")
+                specs.push_back({ListColumn::Samplerate, config.getInt("samplerate_w", 5)});
+        }
+
         for (const auto &res : results)
         {
-            for (size_t i = 0; i < columns.size(); ++i)
+            for (const auto &spec : specs)
             {
-                std::string col = toLower(columns[i]);
-
-                if (col == "name" || col == "filename")
+                const int w = spec.width;
+                switch (spec.id)
                 {
-                    int w = config.getInt("name_w", 25);
+                case ListColumn::Name:
                     std::cout << padString(res.filename, w);
-                }
-                else if (col == "artist")
-                {
-                    int w = config.getInt("artist_w", 15);
+                    break;
+                case ListColumn::Artist:
                     std::cout << DIM << " - " << RESET; // Separator visual
                     std::cout << padString(res.artist, w);
-                }
-                else if (col == "album")
-                {
-                    int w = config.getInt("album_w", 20);
+                    break;
+                case ListColumn::Album:
                     std::cout << DIM << " [" << RESET;
                     std::cout << padString(res.album, w);
                     std::cout << DIM << "]" << RESET;
-                }
-                else if (col == "title")
-                {
-                    int w = config.getInt("title_w", 20);
+                    break;
+                case ListColumn::Title:
                     std::cout << " " << padString(res.title, w);
-                }
-                else if (col == "genre")
-                {
-                    int w = config.getInt("genre_w", 10);
+                    break;
+                case ListColumn::Genre:
                     std::cout << " " << padString(res.genre, w);
-                }
-                else if (col == "year")
-                {
-                    int w = config.getInt("year_w", 4);
+                    break;
+                case ListColumn::Year:
                     std::cout << " " << std::setw(w) << (res.year > 0 ? std::to_string(res.year) : std::string(w, ' '));
-                }
-                else if (col == "track")
-                {
-                    int w = config.getInt("track_w", 2);
+                    break;
+                case ListColumn::Track:
                     std::cout << " " << std::setw(w) << (res.track > 0 ? std::to_string(res.track) : std::string(w, ' '));
-                }
-                else if (col == "bpm")
-                {
-                    int w = config.getInt("bpm_w", 3);
+                    break;
+                case ListColumn::Bpm:
                     if (res.bpm >= 0.1)
                         std::cout << " " << GREEN << std::setw(w) << (int)res.bpm << RESET;
                     else
                         std::cout << " " << std::string(w, ' ');
-                }
-                else if (col == "key")
-                {
-                    int w = config.getInt("key_w", 3);
+                    break;
+                case ListColumn::Key:
                     if (!res.keyCamelot.empty() && res.keyCamelot != "???")
                         std::cout << " " << YELLOW << std::setw(w) << std::left << truncate(res.keyCamelot, w) << RESET;
                     else
                         std::cout << " " << std::string(w, ' ');
-                }
-                else if (col == "energy")
-                {
-                    int w = config.getInt("energy_w", 3);
+                    break;
+                case ListColumn::Energy:
                     if (res.energy >= 0.01)
                         std::cout << " " << std::fixed << std::setprecision(1) << std::setw(w) << res.energy;
                     else
                         std::cout << " " << std::string(w, ' ');
-                }
-                else if (col == "size")
-                {
-                    int w = config.getInt("size_w", 4);
+                    break;
+                case ListColumn::Size:
                     std::cout << " " << CYAN << std::fixed << std::setprecision(1) << std::setw(w) << res.fileSizeMB << "MB" << RESET;
-                }
-                else if (col == "duration")
+                    break;
+                case ListColumn::Duration:
                 {
-                    // Duration format is fixed (MM:SS), so width is essentially fixed or minimum 5
-                    int w = config.getInt("duration_w", 5);
                     int min = (int)res.durationSec / 60;
                     int sec = (int)res.durationSec % 60;
                     std::stringstream ss;
                     ss << std::setw(2) << std::setfill('0') << min << ":" << std::setw(2) << sec;
                     std::cout << " " << std::setw(w) << std::setfill(' ') << ss.str();
+                    break;
                 }
-                else if (col == "bitrate")
-                {
-                    int w = config.getInt("bitrate_w", 3);
+                case ListColumn::Bitrate:
                     std::cout << " " << std::setw(w) << res.bitrate << "k";
-                }
-                else if (col == "samplerate")
-                {
-                    int w = config.getInt("samplerate_w", 5);
+                    break;
+                case ListColumn::Samplerate:
                     std::cout << " " << std::setw(w) << res.sampleRate;
+                    break;
                 }
             }
             std::cout << "\n";
@@ -1423,11 +2122,12 @@ void printTable(std::vector<AudioAnalysis> &results, const ProgramArgs &args, Co
     }
     else
     {
+        // Nome (configurável)
+        const int nameWidth = config.getInt("ana_name_w", 20);
+
         // Análise compacta - uma linha por arquivo
         for (const auto &res : results)
         {
-            // Nome (configurável)
-            int nameWidth = config.getInt("ana_name_w", 20);
             std::cout << padString(res.filename, nameWidth);
 
             // BPM (3 chars fixos)
@@ -1488,32 +2188,33 @@ void saveCsv(const std::vector<AudioAnalysis> &results, const std::string &filen
     // Colunas compactas
     f << "file,path,bpm,energy,key,sec,mb,title,artist\n";
 
-    auto csv_quote = [](const std::string &s)
+    // Escreve o campo entre aspas direto no stream, sem strings intermediárias
+    auto csv_quote = [&f](const std::string &s) -> std::ofstream &
     {
-        std::string temp = s;
-        std::string result;
-        result.reserve(temp.length() + 2);
-        for (char c : temp)
+        f << '"';
+        size_t start = 0;
+        size_t pos;
+        while ((pos = s.find('"', start)) != std::string::npos)
         {
-            if (c == '"')
-                result += "\"\"";
-            else
-                result += c;
+            f.write(s.data() + start, pos - start + 1) << '"'; // Aspas viram ""
+            start = pos + 1;
         }
-        return "\"" + result + "\"";
+        f.write(s.data() + start, s.size() - start) << '"';
+        return f;
     };
 
+    f << std::fixed;
     for (const auto &r : results)
     {
-        f << csv_quote(r.filename) << ","
-          << csv_quote(r.path) << ","
-          << std::fixed << std::setprecision(2) << r.bpm << ","
-          << std::fixed << std::setprecision(2) << r.energy << ","
-          << csv_quote(r.keyCamelot) << ","
-          << std::fixed << std::setprecision(1) << r.durationSec << ","
-          << std::fixed << std::setprecision(1) << r.fileSizeMB << ","
-          << csv_quote(r.title) << ","
-          << csv_quote(r.artist) << "\n";
+        csv_quote(r.filename) << ",";
+        csv_quote(r.path) << ","
+                          << std::setprecision(2) << r.bpm << ","
+                          << std::setprecision(2) << r.energy << ",";
+        csv_quote(r.keyCamelot) << ","
+                                << std::setprecision(1) << r.durationSec << ","
+                                << std::setprecision(1) << r.fileSizeMB << ",";
+        csv_quote(r.title) << ",";
+        csv_quote(r.artist) << "\n";
     }
     log("SUCCESS", "CSV: " + filename);
 }
@@ -1527,7 +2228,7 @@ void saveCsv(const std::vector<AudioAnalysis> &results, const std::string &filen
  * @param progName Nome do programa (argv[0])
  *
  * Mostra:
- * - Opções básicas (-r, -q, -l, -csv, -o, -meta, -limit)
+ * - Opções básicas (-r, -q, -l, -csv, -o, -meta, -nocache, -limit)
  * - Filtros (-bpm-min/max, -size-min/max, -key, -ext)
  * - Saída/Tags (-sort, -put, -putforce)
  * - Exemplo de uso
@@ -1543,6 +2244,7 @@ void printHelp(const char *progName)
               << "  -csv        Saída CSV\n"
               << "  -o <file>   Salvar em arquivo\n"
               << "  -meta       Gerar .analisemetadata\n"
+              << "  -nocache    Reanalisar tudo, sem caches (não escreve nada)\n"
               << "  -limit <N>  Limitar a N arquivos\n\n"
               << "Filtros:\n"
               << "  -bpm-min/max N   Filtrar por BPM\n"
@@ -1552,7 +2254,7 @@ void printHelp(const char *progName)
               << "Saída/Tags:\n"
               << "  -sort <list>     Ordenar (name,bpm,size,key,energy)\n"
               << "  -put <list>      Escrever tags (bpm,energy,key)\n"
-              << "  -putforce        Forçar escrita (sobrescrever álbum)\n"
+              << "  -putforce        Forçar escrita (sobrescrever álbum, reanalisar sem caches)\n"
               << "  -config <k=v>    Atualizar configuração (ex: name_w=50)\n"
               << "  -config          Listar configurações atuais\n"
               << "  -cover <path>    Embutir imagem de capa (jpg/png)\n"
@@ -1619,7 +2321,8 @@ int main(int argc, char *argv[])
                 std::string nextArg = argv[i + 1];
                 // Verifica se é uma lista de colunas válida (contém vírgula ou é um nome de coluna conhecido)
                 // Colunas conhecidas: name, artist, album, title, genre, year, track, bpm, key, energy, size, duration, bitrate, samplerate
-                std::set<std::string> validCols = {"name", "filename", "artist", "album", "title", "genre", "year", "track", "bpm", "key", "energy", "size", "duration", "bitrate", "samplerate"};
+                // Tabela constante, montada uma única vez
+                static const std::set<std::string> validCols = {"name", "filename", "artist", "album", "title", "genre", "year", "track", "bpm", "key", "energy", "size", "duration", "bitrate", "samplerate"};
 
                 bool isColumnList = false;
                 if (nextArg.find(',') != std::string::npos)
@@ -1648,6 +2351,8 @@ int main(int argc, char *argv[])
             args.putForce = true;
         else if (arg == "-meta")
             args.meta = true;
+        else if (arg == "-nocache" || arg == "-no-cache")
+            args.noCache = true;
         else if (arg == "-o" && i + 1 < argc)
             args.outputFile = argv[++i];
         else if (arg == "-limit" && i + 1 < argc)
@@ -1701,7 +2406,7 @@ int main(int argc, char *argv[])
             }
         }
         else if (arg == "-key" && i + 1 < argc)
-            args.targetKey = argv[++i];
+            args.targetKey = toLower(argv[++i]); // Normalizado uma vez, não por arquivo
         else if (arg == "-ext" && i + 1 < argc)
         {
             std::string extList = argv[++i];
@@ -1817,42 +2522,43 @@ int main(int argc, char *argv[])
 
     if (!IS_SILENT)
     {
-#ifdef _WIN32
-        system("cls");
-#else
-        system("clear");
-#endif
+        clearScreen();
     }
 
     // Inicializa o SDK Superpowered (necessário para análise de áudio)
     Superpowered::Initialize("ExampleLicenseKey-WillExpire-OnNextUpdate");
-    Amalyzer amalyzer; // Instância do analisador de áudio
 
     // ==============================
     // BUSCA DE ARQUIVOS
     // ==============================
+    // findFiles já aplica -ext/-size-min/-size-max e para ao atingir -limit.
+    // Os tamanhos são obtidos uma única vez ali e repassados aos workers.
+    // Na análise a lista completa é montada antes (para ordenar por tamanho);
+    // no modo lista a busca roda junto com a leitura das tags, mais abaixo
     std::vector<std::string> files;
-    for (const auto &p : args.paths)
-    {
-        findFiles(p, files, args);
-    }
-
-    if (files.empty())
+    std::vector<uintmax_t> sizes;
+    if (!args.listMode)
     {
-        log("INFO", "Nenhum arquivo.");
-        return 0;
-    }
+        size_t found = 0;
+        for (const auto &p : args.paths)
+        {
+            findFiles(p, args, found, [&](std::string &&path, uintmax_t size)
+                      {
+                files.push_back(std::move(path));
+                sizes.push_back(size); });
+        }
 
-    // Aplica limite de arquivos se especificado
-    if (args.limit > 0 && files.size() > (size_t)args.limit)
-    {
-        files.resize(args.limit);
+        if (files.empty())
+        {
+            log("INFO", "Nenhum arquivo.");
+            return 0;
+        }
     }
 
     if (!IS_SILENT)
     {
         std::cout << BOLD << CYAN << "🎵 Amalyzer" << RESET << "\n";
-        std::cout << DIM << "════════════════════════" << RESET << "\n\n";
+        std::cout << DIM << SEPARATOR_DOUBLE << RESET << "\n\n";
     }
 
     if (args.listMode)
@@ -1868,108 +2574,205 @@ int main(int argc, char *argv[])
     // PROCESSAMENTO DOS ARQUIVOS
     // ==============================
     std::vector<AudioAnalysis> results;
-    int processedCount = 0;
-    int totalFiles = files.size();
-
-    for (const auto &fpath : files)
+    std::vector<AudioAnalysis> processed;
+
+    int processedCount = 0; // Protegido por OUTPUT_MUTEX
+
+    const unsigned int hardwareThreads = availableCores();
+    // Análise é limitada pela CPU: um worker por núcleo. O modo lista só lê
+    // tags e passa a maior parte do tempo esperando o disco, então pode usar
+    // mais threads para manter várias leituras em andamento; começa só com a
+    // thread chamadora e cresce enquanto a busca acumula arquivos na fila
+    const unsigned int maxListWorkers = std::min(32u, hardwareThreads * 4);
+    unsigned int workerCount = args.listMode ? 1 : hardwareThreads;
+    if (!args.listMode && workerCount > files.size())
+        workerCount = files.size();
+
+    // Menos arquivos que núcleos: cada worker decodifica numa thread auxiliar
+    // enquanto analisa, ocupando os núcleos que ficariam ociosos
+    const bool pipelinedDecode = !args.listMode && hardwareThreads >= workerCount * 2;
+
+    // Threads criadas uma única vez e reaproveitadas pelas etapas seguintes
+    WorkerPool pool(workerCount);
+
+    // Um analisador por worker, reaproveitado entre arquivos. Criado no
+    // primeiro arquivo do worker: no modo lista o pool pode crescer depois
+    std::vector<std::unique_ptr<Amalyzer>> amalyzers(args.listMode ? maxListWorkers : pool.size());
+    auto amalyzerFor = [&](unsigned int worker) -> Amalyzer &
     {
-        AudioAnalysis res;
-        res.path = fpath;
-        res.filename = fs::path(fpath).filename().string();
-
-        // Obtém tamanho do arquivo
-        try
-        {
-            res.fileSizeMB = (double)fs::file_size(fpath) / (1024.0 * 1024.0);
-        }
-        catch (...)
+        std::unique_ptr<Amalyzer> &a = amalyzers[worker];
+        if (!a)
         {
-            res.fileSizeMB = 0.0;
+            a.reset(new Amalyzer());
+            a->setPipelinedDecode(pipelinedDecode);
         }
+        return *a;
+    };
 
-        // Lê metadados básicos usando TagLib (título, artista, álbum, etc)
-        try
-        {
-            TagLib::FileRef f(fpath.c_str());
-            if (!f.isNull() && f.tag())
+    if (!args.listMode)
+    {
+        int totalFiles = files.size();
+
+        // Ordem de despacho: maiores primeiro (LPT), para que as faixas longas
+        // não fiquem para o fim e deixem os outros workers ociosos
+        std::vector<size_t> order(files.size());
+        for (size_t i = 0; i < files.size(); ++i)
+            order[i] = i;
+        std::stable_sort(order.begin(), order.end(), [&](size_t a, size_t b)
+                         { return sizes[a] > sizes[b]; });
+
+        // Cada worker pega blocos de arquivos, amortizando a disputa pelo contador
+        const size_t chunkSize = std::max<size_t>(1, files.size() / (workerCount * 4));
+        processed.resize(files.size());
+
+        // Se o último arquivo de cada worker precisou ser decodificado (controla a leitura antecipada)
+        std::vector<char> workerDecoded(pool.size(), 1);
+
+        pool.run(order.size(), chunkSize, [&](unsigned int worker, size_t k)
+                 {
+            size_t idx = order[k];
+
+            // Lê antecipadamente o próximo arquivo do mesmo bloco deste worker:
+            // sua leitura do disco corre em paralelo com a análise deste. O
+            // primeiro de outro bloco já está com outro worker, então não entra.
+            // Se o último arquivo do worker veio de cache (tags/meta), os
+            // próximos provavelmente também virão: não vale ler o arquivo inteiro
+            if (workerDecoded[worker] && (k + 1) % chunkSize != 0 && k + 1 < order.size())
+                prefetchFile(files[order[k + 1]]);
+
+            AudioAnalysis &res = processed[idx];
+            bool decoded = false;
+            res = processFile(files[idx], sizes[idx], args, amalyzerFor(worker), &decoded);
+            workerDecoded[worker] = decoded;
+
+            if (!args.quiet)
             {
-                res.title = f.tag()->title().toCString(true);
-                res.artist = f.tag()->artist().toCString(true);
-                res.album = f.tag()->album().toCString(true);
-                res.genre = f.tag()->genre().toCString(true);
-                res.year = f.tag()->year();
-                res.track = f.tag()->track();
-                if (f.audioProperties())
-                {
-                    res.bitrate = f.audioProperties()->bitrate();
-                    res.sampleRate = f.audioProperties()->sampleRate();
-                    res.channels = f.audioProperties()->channels();
-                    if (args.listMode)
-                        res.durationSec = f.audioProperties()->lengthInSeconds();
-                }
+                std::lock_guard<std::mutex> lock(OUTPUT_MUTEX);
+                drawProgressBar(++processedCount, totalFiles, res.filename);
+            } });
+
+        // Falhas ficam registradas no próprio resultado e são reportadas aqui,
+        // na ordem original, em vez de interromper a barra de progresso
+        bool barLineOpen = !args.quiet;
+        for (const auto &res : processed)
+        {
+            if (res.success)
+                continue;
+            if (barLineOpen)
+            {
+                std::cout << "\n";
+                barLineOpen = false;
             }
+            log("ERROR", "Falha: " + res.errorMessage, res.filename);
         }
-        catch (...)
-        {
-        }
-
-        // Realiza análise de áudio (BPM, Energy, Key) se não estiver em modo lista
-        if (!args.listMode)
-        {
-            // Perform Audio Analysis
-            AudioAnalysis analysis = amalyzer.analyze(fpath);
-            if (analysis.success)
+    }
+    else
+    {
+        // Modo lista: a busca roda numa thread própria e entrega cada arquivo
+        // aos workers assim que é encontrado, em vez de esperar a varredura
+        // inteira. O total ainda é desconhecido: a barra usa o que já foi achado
+        struct PendingFile
+        {
+            size_t index; // Ordem de descoberta, usada para remontar os resultados
+            std::string path;
+            uintmax_t size;
+        };
+        std::mutex queueMutex;
+        std::condition_variable queueReady;
+        std::deque<PendingFile> pending;
+        bool scanDone = false;
+        std::atomic<size_t> discovered{0};
+
+        std::thread scanner([&]()
+                            {
+            size_t found = 0;
+            for (const auto &p : args.paths)
             {
-                res.bpm = analysis.bpm;
-                res.energy = analysis.energy;
-                res.keyCamelot = analysis.keyCamelot;
-                res.keyIndex = analysis.keyIndex;
-                res.durationSec = analysis.durationSec;
-                res.success = true;
+                findFiles(p, args, found, [&](std::string &&path, uintmax_t size)
+                          {
+                    size_t backlog;
+                    {
+                        std::lock_guard<std::mutex> lock(queueMutex);
+                        pending.push_back({discovered.load(), std::move(path), size});
+                        ++discovered;
+                        backlog = pending.size();
+                    }
+                    queueReady.notify_one();
+
+                    // Arquivos acumulando na fila: os workers não dão conta da
+                    // busca, então entra mais um (nunca mais que os pendentes)
+                    if (backlog > 1 && pool.size() < maxListWorkers)
+                        pool.grow(pool.size() + 1); });
             }
-            else
             {
-                res.success = false;
-                res.errorMessage = analysis.errorMessage;
+                std::lock_guard<std::mutex> lock(queueMutex);
+                scanDone = true;
             }
-        }
-        else
-        {
-            res.success = true;
-        }
+            queueReady.notify_all(); });
+
+        // Uma tarefa por worker possível; cada uma consome a fila até a busca
+        // terminar. Workers que entram depois pegam as tarefas que sobraram;
+        // as que começam com a busca já terminada retornam na hora
+        std::vector<std::vector<std::pair<size_t, AudioAnalysis>>> streamed(maxListWorkers);
+        pool.run(maxListWorkers, 1, [&](unsigned int worker, size_t task)
+                 {
+            while (true)
+            {
+                PendingFile item;
+                {
+                    std::unique_lock<std::mutex> lock(queueMutex);
+                    queueReady.wait(lock, [&]
+                                    { return !pending.empty() || scanDone; });
+                    if (pending.empty())
+                        return;
+                    item = std::move(pending.front());
+                    pending.pop_front();
+                }
 
-        // Aplica filtros (BPM, tamanho, key)
-        if (res.success)
-        {
-            bool keep = true;
-            if (args.minBpm > 0 && res.bpm < args.minBpm)
-                keep = false;
-            if (args.maxBpm > 0 && res.bpm > args.maxBpm)
-                keep = false;
-            if (args.minSizeMB > 0 && res.fileSizeMB < args.minSizeMB)
-                keep = false;
-            if (args.maxSizeMB > 0 && res.fileSizeMB > args.maxSizeMB)
-                keep = false;
-            if (!args.targetKey.empty() && toLower(res.keyCamelot) != toLower(args.targetKey))
-                keep = false;
+                AudioAnalysis res = processFile(item.path, item.size, args, amalyzerFor(worker));
 
-            if (keep)
-            {
-                results.push_back(res);
-            }
-        }
-        else if (!args.listMode)
-        {
-            log("ERROR", "Falha: " + res.errorMessage, res.filename);
-        }
+                if (!args.quiet)
+                {
+                    std::lock_guard<std::mutex> lock(OUTPUT_MUTEX);
+                    drawProgressBar(++processedCount, (int)discovered.load(), res.filename);
+                }
+                streamed[task].emplace_back(item.index, std::move(res));
+            } });
+        scanner.join();
 
-        processedCount++;
-        if (!args.quiet)
+        // Devolve os resultados à ordem em que os arquivos foram encontrados
+        processed.resize(discovered.load());
+        for (auto &batch : streamed)
+            for (auto &entry : batch)
+                processed[entry.first] = std::move(entry.second);
+
+        if (processed.empty())
         {
-            drawProgressBar(processedCount, totalFiles, res.filename);
+            log("INFO", "Nenhum arquivo.");
+            return 0;
         }
     }
 
+    // Filtros (BPM, key) resolvidos uma única vez; o de tamanho já foi aplicado.
+    // Limites não informados viram ±infinito, e cada item faz no máximo
+    // duas comparações de BPM e uma de key
+    const double bpmLow = args.minBpm > 0 ? args.minBpm : -std::numeric_limits<double>::infinity();
+    const double bpmHigh = args.maxBpm > 0 ? args.maxBpm : std::numeric_limits<double>::infinity();
+    const std::string &targetKey = args.targetKey;
+    const bool filterKey = !targetKey.empty();
+    auto passesFilters = [&](const AudioAnalysis &res)
+    {
+        return res.success && res.bpm >= bpmLow && res.bpm <= bpmHigh &&
+               (!filterKey || equalsIgnoreCase(res.keyCamelot, targetKey));
+    };
+
+    // Aplica os filtros na ordem original dos arquivos: compacta o próprio vetor
+    // movendo os aprovados para frente (sem copiar nenhum AudioAnalysis)
+    processed.erase(std::remove_if(processed.begin(), processed.end(), [&](const AudioAnalysis &res)
+                                   { return !passesFilters(res); }),
+                    processed.end());
+    results = std::move(processed);
+
     if (!args.quiet)
         std::cout << "\n\n";
 
@@ -1980,18 +2783,63 @@ int main(int argc, char *argv[])
         return 0;
     }
 
+    // As etapas abaixo só fazem E/S por arquivo e são independentes entre
+    // arquivos: cada uma roda no mesmo pool da análise, e a próxima etapa só
+    // começa quando a anterior termina (a ordem por arquivo é preservada)
+    const bool hasWritePhase = !args.listMode &&
+                               (!args.tagsToWrite.empty() || args.meta || !args.coverPath.empty() ||
+                                args.removeCover || args.removeAllTags || !args.tagsToRemove.empty() ||
+                                !args.tagOps.empty());
+
+    // Caminhos repetidos (ex: "pasta pasta/a.mp3") geram dois resultados do
+    // mesmo arquivo, e dois workers gravariam nele ao mesmo tempo. As etapas
+    // de escrita usam só a primeira ocorrência de cada caminho canônico
+    std::vector<const AudioAnalysis *> writeTargets;
+    if (hasWritePhase)
+    {
+        std::set<std::string> seenPaths;
+        writeTargets.reserve(results.size());
+        for (const auto &res : results)
+        {
+            std::error_code ec;
+            fs::path canonical = fs::weakly_canonical(res.path, ec);
+            if (seenPaths.insert(ec ? res.path : canonical.string()).second)
+                writeTargets.push_back(&res);
+        }
+    }
+
+    // Executa uma etapa de escrita no pool. Qualquer exceção é tratada aqui,
+    // dentro da tarefa: nada pode escapar da thread do worker
+    auto runWritePhase = [&](const std::string &phase, const std::function<void(const AudioAnalysis &)> &action)
+    {
+        pool.run(writeTargets.size(), 1, [&](unsigned int, size_t i)
+                 {
+            const AudioAnalysis &res = *writeTargets[i];
+            try
+            {
+                action(res);
+            }
+            catch (const std::exception &e)
+            {
+                log("ERROR", "Erro " + phase + ": " + std::string(e.what()), res.filename);
+            }
+            catch (...)
+            {
+                log("ERROR", "Erro " + phase + ": exceção desconhecida", res.filename);
+            } });
+    };
+
     // ==============================
     // ESCRITA DE TAGS
     // ==============================
     if (!args.tagsToWrite.empty() && !args.listMode)
     {
         log("INFO", "Escrevendo tags...");
-        for (const auto &res : results)
-        {
-            writeTags(res, args.tagsToWrite, args.putForce);
-        }
+        const TagSelection tagsToWrite = makeTagSelection(args.tagsToWrite);
+        runWritePhase("tags", [&](const AudioAnalysis &res)
+                      { writeTags(res, tagsToWrite, args.putForce); });
         if (!IS_SILENT)
-            std::cout << DIM << "────────────────────────" << RESET << "\n";
+            std::cout << DIM << SEPARATOR << RESET << "\n";
     }
 
     // ==============================
@@ -2000,10 +2848,8 @@ int main(int argc, char *argv[])
     if (args.meta && !args.listMode)
     {
         log("INFO", "Gerando meta...");
-        for (const auto &res : results)
-        {
-            saveMetadataFile(res);
-        }
+        runWritePhase("meta", [&](const AudioAnalysis &res)
+                      { saveMetadataFile(res); });
     }
 
     // ==============================
@@ -2012,9 +2858,11 @@ int main(int argc, char *argv[])
     if (!args.coverPath.empty() && !args.listMode)
     {
         log("INFO", "Adicionando capas...");
-        for (const auto &res : results)
+        CoverImage cover;
+        if (loadCoverImage(args.coverPath, cover))
         {
-            embedCover(res.path, args.coverPath);
+            runWritePhase("capa", [&](const AudioAnalysis &res)
+                          { embedCover(res, cover); });
         }
     }
 
@@ -2024,10 +2872,8 @@ int main(int argc, char *argv[])
     if (args.removeCover && !args.listMode)
     {
         log("INFO", "Removendo capas...");
-        for (const auto &res : results)
-        {
-            removeCover(res.path);
-        }
+        runWritePhase("remover capa", [&](const AudioAnalysis &res)
+                      { removeCover(res); });
     }
 
     // ==============================
@@ -2036,18 +2882,14 @@ int main(int argc, char *argv[])
     if (args.removeAllTags && !args.listMode)
     {
         log("INFO", "Removendo TODAS as tags...");
-        for (const auto &res : results)
-        {
-            removeAllTags(res.path);
-        }
+        runWritePhase("remover todas tags", [&](const AudioAnalysis &res)
+                      { removeAllTags(res); });
     }
     else if (!args.tagsToRemove.empty() && !args.listMode)
     {
         log("INFO", "Removendo tags específicas...");
-        for (const auto &res : results)
-        {
-            removeTags(res.path, args.tagsToRemove);
-        }
+        runWritePhase("remover tags", [&](const AudioAnalysis &res)
+                      { removeTags(res, args.tagsToRemove); });
     }
 
     // ==============================
@@ -2056,31 +2898,61 @@ int main(int argc, char *argv[])
     if (!args.tagOps.empty() && !args.listMode)
     {
         log("INFO", "Editando tags...");
-        for (const auto &res : results)
-        {
-            applyTagOperations(res.path, args.tagOps);
-        }
+        runWritePhase("editar tags", [&](const AudioAnalysis &res)
+                      { applyTagOperations(res, args.tagOps); });
     }
 
     // ==============================
     // ORDENAÇÃO DOS RESULTADOS
     // ==============================
-    // Aplica critérios de ordenação em ordem reversa (último critério tem prioridade)
-    for (auto it = args.sortBy.rbegin(); it != args.sortBy.rend(); ++it)
-    {
-        std::string key = *it;
-        std::stable_sort(results.begin(), results.end(), [&](const AudioAnalysis &a, const AudioAnalysis &b)
-                         {
-            if (key == "bpm") return a.bpm < b.bpm;
-            if (key == "energy") return a.energy < b.energy;
-            if (key == "key") return a.keyCamelot < b.keyCamelot;
-            if (key == "size") return a.fileSizeMB < b.fileSizeMB;
-            if (key == "album") return a.album < b.album;
-            if (key == "artist") return a.artist < b.artist;
-            if (key == "title") return a.title < b.title;
-            return a.filename < b.filename; });
+    // Uma única ordenação com chave composta: o primeiro critério tem prioridade e
+    // os seguintes só desempatam (equivale a K stable_sort em ordem reversa)
+    // Critérios convertidos uma única vez; a comparação só faz um switch por critério
+    enum class SortKey
+    {
+        Name, Bpm, Energy, Key, Size, Album, Artist, Title
+    };
+    std::vector<SortKey> sortKeys;
+    sortKeys.reserve(args.sortBy.size());
+    for (const auto &key : args.sortBy)
+    {
+        if (key == "bpm") sortKeys.push_back(SortKey::Bpm);
+        else if (key == "energy") sortKeys.push_back(SortKey::Energy);
+        else if (key == "key") sortKeys.push_back(SortKey::Key);
+        else if (key == "size") sortKeys.push_back(SortKey::Size);
+        else if (key == "album") sortKeys.push_back(SortKey::Album);
+        else if (key == "artist") sortKeys.push_back(SortKey::Artist);
+        else if (key == "title") sortKeys.push_back(SortKey::Title);
+        else sortKeys.push_back(SortKey::Name);
     }
 
+    auto compareBy = [](SortKey key, const AudioAnalysis &a, const AudioAnalysis &b)
+    {
+        auto cmp = [](double x, double y)
+        { return x < y ? -1 : (y < x ? 1 : 0); };
+        switch (key)
+        {
+        case SortKey::Bpm: return cmp(a.bpm, b.bpm);
+        case SortKey::Energy: return cmp(a.energy, b.energy);
+        case SortKey::Key: return a.keyCamelot.compare(b.keyCamelot);
+        case SortKey::Size: return cmp(a.fileSizeMB, b.fileSizeMB);
+        case SortKey::Album: return a.album.compare(b.album);
+        case SortKey::Artist: return a.artist.compare(b.artist);
+        case SortKey::Title: return a.title.compare(b.title);
+        case SortKey::Name: break;
+        }
+        return a.filename.compare(b.filename);
+    };
+    std::stable_sort(results.begin(), results.end(), [&](const AudioAnalysis &a, const AudioAnalysis &b)
+                     {
+        for (SortKey key : sortKeys)
+        {
+            int c = compareBy(key, a, b);
+            if (c != 0)
+                return c < 0;
+        }
+        return false; });
+
     // ==============================
     // SAÍDA DOS RESULTADOS
     // ==============================